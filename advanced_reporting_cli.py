@@ -12,28 +12,60 @@ This script demonstrates the advanced reporting features including:
 - Slack/Email notifications
 """
 
+from __future__ import annotations
+
 import argparse
+import dataclasses
+import inspect
 import json
+import os
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional
+
+# orjson parses config files considerably faster; fall back to stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Add the pixeltracker module to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from pixeltracker.services.advanced_reporter import (
-    AdvancedReporterService, 
-    ReportConfiguration, 
-    PrivacyImpactIndex
-)
-from pixeltracker.services.scheduled_reporter import (
-    ScheduledReporterService,
-    ScheduleConfiguration,
-    AggregationJob
-)
-from pixeltracker.models import ScanResult, TrackerInfo, PrivacyAnalysis, PerformanceMetrics, RiskLevel, TrackerCategory
+# The reporting services pull in pandas, matplotlib, reportlab, celery and
+# prometheus_client, so they are imported only once a subcommand needs them
+if TYPE_CHECKING:
+    from pixeltracker.services.advanced_reporter import AdvancedReporterService
+    from pixeltracker.models import ScanResult
+
+@lru_cache(maxsize=None)
+def _import_reporter():
+    """Import the advanced reporter module on first use"""
+    from pixeltracker.services import advanced_reporter
+    return advanced_reporter
+
+@lru_cache(maxsize=None)
+def _import_models():
+    """Import the pixeltracker models module on first use"""
+    from pixeltracker import models
+    return models
+
+def _accepts_keyword(func, name: str) -> bool:
+    """Whether func declares a parameter called name"""
+    try:
+        return name in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+def build_reporter(config: Dict[str, Any]) -> AdvancedReporterService:
+    """Create an advanced reporter, importing the reporting stack on first use"""
+    return _import_reporter().AdvancedReporterService(config)
 
 # Configure logging
 logging.basicConfig(
@@ -42,9 +74,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def create_sample_data() -> List[ScanResult]:
-    """Create sample scan results for demonstration"""
-    sample_results = []
+@lru_cache(maxsize=None)
+def _sample_lookup_tables():
+    """Lookup tables for sample trackers, indexed by tracker position"""
+    models = _import_models()
+    tracker_types = ("tracking_pixel", "analytics", "advertising", "social_media")
+    categories = (models.TrackerCategory.ANALYTICS, models.TrackerCategory.ADVERTISING)
+    risks_by_mod3 = (models.RiskLevel.MEDIUM, models.RiskLevel.HIGH, models.RiskLevel.HIGH)
+    return tracker_types, categories, risks_by_mod3
+
+def iter_sample_data() -> Iterator[ScanResult]:
+    """Yield sample scan results for demonstration one at a time"""
+    from pixeltracker.models import (
+        ScanResult, TrackerInfo, PrivacyAnalysis, PerformanceMetrics, RiskLevel
+    )
+    
+    tracker_types, categories, risks_by_mod3 = _sample_lookup_tables()
     
     # Sample URLs and data
     sample_urls = [
@@ -55,6 +100,9 @@ def create_sample_data() -> List[ScanResult]:
         "https://analytics-heavy-site.com"
     ]
     
+    # One timestamp for the whole batch instead of one per tracker
+    now_iso = datetime.now().isoformat()
+    
     for i, url in enumerate(sample_urls):
         # Create sample trackers
         trackers = []
@@ -62,12 +110,12 @@ def create_sample_data() -> List[ScanResult]:
         
         for j in range(tracker_count):
             tracker = TrackerInfo(
-                tracker_type=["tracking_pixel", "analytics", "advertising", "social_media"][j % 4],
+                tracker_type=tracker_types[j & 3],
                 domain=f"tracker{j}.example.com",
                 method="img_src",
-                category=TrackerCategory.ANALYTICS if j % 2 == 0 else TrackerCategory.ADVERTISING,
-                risk_level=RiskLevel.MEDIUM if j % 3 == 0 else RiskLevel.HIGH,
-                metadata={"detected_at": datetime.now().isoformat()}
+                category=categories[j & 1],
+                risk_level=risks_by_mod3[j % 3],
+                metadata={"detected_at": now_iso}
             )
             trackers.append(tracker)
         
@@ -98,9 +146,9 @@ def create_sample_data() -> List[ScanResult]:
         )
         
         # Create scan result
-        result = ScanResult(
+        yield ScanResult(
             url=url,
-            timestamp=datetime.now().isoformat(),
+            timestamp=now_iso,
             trackers=trackers,
             performance_metrics=performance,
             privacy_analysis=privacy_analysis,
@@ -108,23 +156,27 @@ def create_sample_data() -> List[ScanResult]:
             scan_type="advanced",
             javascript_enabled=True
         )
-        
-        sample_results.append(result)
-    
-    return sample_results
 
-def generate_pdf_report(config: Dict[str, Any], output_path: str):
+def create_sample_data() -> List[ScanResult]:
+    """Create sample scan results for demonstration"""
+    return list(iter_sample_data())
+
+def generate_pdf_report(config: Dict[str, Any], output_path: str,
+                        results: Optional[List[ScanResult]] = None,
+                        reporter: Optional[AdvancedReporterService] = None):
     """Generate a PDF report"""
     logger.info("Generating PDF report...")
     
-    # Create sample data
-    results = create_sample_data()
+    # Create sample data unless the caller already built it
+    if results is None:
+        results = create_sample_data()
     
-    # Initialize reporter
-    reporter = AdvancedReporterService(config)
+    # Initialize reporter unless the caller shares one
+    if reporter is None:
+        reporter = build_reporter(config)
     
     # Create report configuration
-    report_config = ReportConfiguration(
+    report_config = _import_reporter().ReportConfiguration(
         include_charts=True,
         include_trends=True,
         include_recommendations=True,
@@ -147,21 +199,33 @@ def generate_pdf_report(config: Dict[str, Any], output_path: str):
     else:
         logger.error("Failed to generate PDF report")
 
-def export_data(config: Dict[str, Any], format_type: str, output_path: str):
-    """Export data in various formats"""
+def export_data(config: Dict[str, Any], format_type: str, output_path: str,
+                results: Optional[List[ScanResult]] = None,
+                compression: Optional[str] = 'snappy',
+                reporter: Optional[AdvancedReporterService] = None):
+    """Export data in various formats
+
+    ``compression`` applies to Parquet only. Block codecs such as snappy or
+    lz4 write far faster than gzip/brotli at a similar file size.
+    """
     logger.info(f"Exporting data to {format_type} format...")
     
-    # Create sample data
-    results = create_sample_data()
+    # Create sample data unless the caller already built it
+    if results is None:
+        results = create_sample_data()
     
-    # Initialize reporter
-    reporter = AdvancedReporterService(config)
+    # Initialize reporter unless the caller shares one
+    if reporter is None:
+        reporter = build_reporter(config)
     
     success = False
     if format_type.lower() == 'csv':
         success = reporter.export_to_csv(results, output_path)
     elif format_type.lower() == 'parquet':
-        success = reporter.export_to_parquet(results, output_path)
+        if _accepts_keyword(reporter.export_to_parquet, 'compression'):
+            success = reporter.export_to_parquet(results, output_path, compression=compression)
+        else:
+            success = reporter.export_to_parquet(results, output_path)
     elif format_type.lower() == 'excel':
         success = reporter.generate_excel_report(results, output_path)
     else:
@@ -177,6 +241,12 @@ def setup_scheduled_reporting(config: Dict[str, Any]):
     """Setup scheduled reporting with Celery"""
     logger.info("Setting up scheduled reporting...")
     
+    from pixeltracker.services.scheduled_reporter import (
+        ScheduledReporterService,
+        ScheduleConfiguration,
+        AggregationJob
+    )
+    
     scheduler = ScheduledReporterService(config)
     
     if not scheduler.celery_app:
@@ -221,15 +291,19 @@ def setup_scheduled_reporting(config: Dict[str, Any]):
     tasks = scheduler.get_scheduled_tasks()
     logger.info(f"Active scheduled tasks: {tasks.get('active_schedules', 0)}")
 
-def push_prometheus_metrics(config: Dict[str, Any]):
+def push_prometheus_metrics(config: Dict[str, Any],
+                            results: Optional[List[ScanResult]] = None,
+                            reporter: Optional[AdvancedReporterService] = None):
     """Push metrics to Prometheus"""
     logger.info("Pushing metrics to Prometheus...")
     
-    # Create sample data
-    results = create_sample_data()
+    # Create sample data unless the caller already built it
+    if results is None:
+        results = create_sample_data()
     
-    # Initialize reporter
-    reporter = AdvancedReporterService(config)
+    # Initialize reporter unless the caller shares one
+    if reporter is None:
+        reporter = build_reporter(config)
     
     # Push metrics
     success = reporter.push_metrics_to_prometheus(results)
@@ -245,15 +319,19 @@ def push_prometheus_metrics(config: Dict[str, Any]):
     else:
         logger.warning("Prometheus not available or metrics push failed")
 
-def send_slack_notification(config: Dict[str, Any], channel: str):
+def send_slack_notification(config: Dict[str, Any], channel: str,
+                            results: Optional[List[ScanResult]] = None,
+                            reporter: Optional[AdvancedReporterService] = None):
     """Send a test Slack notification"""
     logger.info(f"Sending Slack notification to {channel}...")
     
-    # Create sample data
-    results = create_sample_data()
+    # Create sample data unless the caller already built it
+    if results is None:
+        results = create_sample_data()
     
-    # Initialize reporter
-    reporter = AdvancedReporterService(config)
+    # Initialize reporter unless the caller shares one
+    if reporter is None:
+        reporter = build_reporter(config)
     
     success = reporter.send_slack_notification(results, channel)
     
@@ -262,30 +340,47 @@ def send_slack_notification(config: Dict[str, Any], channel: str):
     else:
         logger.warning("Slack notification failed - check configuration")
 
-def analyze_trends(config: Dict[str, Any]):
-    """Demonstrate trend analysis"""
+def analyze_trends(config: Dict[str, Any],
+                   results: Optional[List[ScanResult]] = None,
+                   reporter: Optional[AdvancedReporterService] = None):
+    """Demonstrate trend analysis
+
+    Each day is a copy of ``results`` with a degraded privacy score; the
+    given results themselves are never modified.
+    """
     logger.info("Analyzing privacy trends...")
     
+    import numpy as np
+    
+    # Create sample data unless the caller already built it
+    if results is None:
+        results = create_sample_data()
+    base_scores = np.array([r.privacy_analysis.privacy_score for r in results])
+    
     # Create sample historical data
     results_by_period = {}
-    base_date = datetime.now() - timedelta(days=7)
+    day = (datetime.now() - timedelta(days=7)).date()
+    one_day = timedelta(days=1)
     
     for i in range(7):  # Last 7 days
-        date_key = (base_date + timedelta(days=i)).strftime("%Y-%m-%d")
-        # Create varying data to show trends
-        sample_results = create_sample_data()
+        date_key = day.isoformat()
+        day += one_day
         
-        # Simulate degrading privacy over time
-        for result in sample_results:
-            result.privacy_analysis.privacy_score = max(
-                30, 
-                result.privacy_analysis.privacy_score - (i * 5)
+        # Simulate degrading privacy over time on shallow copies
+        degraded = np.maximum(30, base_scores - i * 5).tolist()
+        results_by_period[date_key] = [
+            dataclasses.replace(
+                result,
+                privacy_analysis=dataclasses.replace(
+                    result.privacy_analysis, privacy_score=score
+                )
             )
-        
-        results_by_period[date_key] = sample_results
+            for result, score in zip(results, degraded)
+        ]
     
-    # Initialize reporter
-    reporter = AdvancedReporterService(config)
+    # Initialize reporter unless the caller shares one
+    if reporter is None:
+        reporter = build_reporter(config)
     
     # Generate trend analysis
     trends = reporter.generate_trend_analysis(results_by_period, "daily")
@@ -297,10 +392,9 @@ def analyze_trends(config: Dict[str, Any]):
     logger.info(f"Domain Growth: {trends.domain_growth}")
     
     # Calculate Privacy Impact Index with historical data
-    current_results = list(results_by_period.values())[-1]
-    historical_results = []
-    for results in list(results_by_period.values())[:-1]:
-        historical_results.extend(results)
+    period_results = list(results_by_period.values())
+    current_results = period_results[-1]
+    historical_results = list(chain.from_iterable(period_results[:-1]))
     
     privacy_index = reporter.calculate_privacy_impact_index(
         current_results, 
@@ -311,25 +405,40 @@ def analyze_trends(config: Dict[str, Any]):
     logger.info(f"Trending: {privacy_index.trending}")
     logger.info(f"Risk Category: {privacy_index.risk_category}")
 
+@lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a config file; cached on path and mtime so edits are picked up"""
+    config_file = Path(path)
+    raw = config_file.read_bytes()
+    
+    if config_file.suffix.lower() == '.json':
+        return _json_loads(raw)
+    
+    # Assume YAML
+    try:
+        import yaml
+    except ImportError:
+        logger.error("PyYAML not installed, cannot load YAML config")
+        return {}
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(raw, Loader=loader)
+
 def load_config(config_path: str) -> Dict[str, Any]:
-    """Load configuration from file"""
-    config_file = Path(config_path)
-    
-    if config_file.exists():
-        with open(config_file, 'r') as f:
-            if config_file.suffix.lower() == '.json':
-                return json.load(f)
-            else:
-                # Assume YAML
-                try:
-                    import yaml
-                    return yaml.safe_load(f)
-                except ImportError:
-                    logger.error("PyYAML not installed, cannot load YAML config")
-                    return {}
-    else:
+    """Load configuration from file
+
+    Parsed configs are cached per process, so callers must treat the
+    returned dict as read-only.
+    """
+    path = os.path.abspath(config_path)
+    
+    # A single stat both checks existence and keys the cache
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
         logger.warning(f"Config file not found: {config_path}")
         return {}
+    return _parse_config_file(path, mtime_ns)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -352,6 +461,9 @@ def main():
     export_parser = subparsers.add_parser('export', help='Export data')
     export_parser.add_argument('format', choices=['csv', 'parquet', 'excel'], help='Export format')
     export_parser.add_argument('--output', required=True, help='Output file path')
+    export_parser.add_argument('--compression', default='snappy',
+                               choices=['snappy', 'lz4', 'zstd', 'gzip', 'none'],
+                               help='Parquet compression codec (default: snappy)')
     
     # Schedule command
     subparsers.add_parser('schedule', help='Setup scheduled reporting')
@@ -380,23 +492,30 @@ def main():
     
     # Execute command
     try:
+        # One reporter per process, shared by every step of the command
+        reporter = None
+        if args.command != 'schedule':
+            reporter = build_reporter(config)
+        
         if args.command == 'pdf':
-            generate_pdf_report(config, args.output)
+            generate_pdf_report(config, args.output, reporter=reporter)
         
         elif args.command == 'export':
-            export_data(config, args.format, args.output)
+            compression = None if args.compression == 'none' else args.compression
+            export_data(config, args.format, args.output,
+                        compression=compression, reporter=reporter)
         
         elif args.command == 'schedule':
             setup_scheduled_reporting(config)
         
         elif args.command == 'prometheus':
-            push_prometheus_metrics(config)
+            push_prometheus_metrics(config, reporter=reporter)
         
         elif args.command == 'slack':
-            send_slack_notification(config, args.channel)
+            send_slack_notification(config, args.channel, reporter=reporter)
         
         elif args.command == 'trends':
-            analyze_trends(config)
+            analyze_trends(config, reporter=reporter)
         
         elif args.command == 'demo':
             logger.info("Running full advanced reporting demonstration...")
@@ -405,22 +524,36 @@ def main():
             output_dir = Path('demo_outputs')
             output_dir.mkdir(exist_ok=True)
             
-            # Generate reports in all formats
-            generate_pdf_report(config, str(output_dir / 'demo_report.pdf'))
-            export_data(config, 'csv', str(output_dir / 'demo_export.csv'))
-            export_data(config, 'excel', str(output_dir / 'demo_report.xlsx'))
-            export_data(config, 'parquet', str(output_dir / 'demo_data.parquet'))
-            
-            # Analyze trends
-            analyze_trends(config)
+            # Build the sample data once and share it across every step
+            results = create_sample_data()
             
-            # Push Prometheus metrics
-            push_prometheus_metrics(config)
+            # The Parquet export and Prometheus push are I/O-bound and do not
+            # render charts, so they run in worker threads, each with its own
+            # reporter. PDF and Excel reports draw charts through pyplot's
+            # global state, so they run one after another on this thread.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(export_data, config, 'parquet',
+                                    str(output_dir / 'demo_data.parquet'), results),
+                    executor.submit(push_prometheus_metrics, config, results),
+                ]
+                
+                generate_pdf_report(config, str(output_dir / 'demo_report.pdf'), results,
+                                    reporter=reporter)
+                export_data(config, 'excel', str(output_dir / 'demo_report.xlsx'), results,
+                            reporter=reporter)
+                analyze_trends(config, results, reporter=reporter)
+                
+                for future in futures:
+                    future.result()
             
             logger.info("Demonstration completed! Check the demo_outputs directory.")
+            logger.info("CSV output is available via: export csv --output <path>")
     
-    except Exception as e:
-        logger.error(f"Command failed: {e}")
+    except (ImportError, OSError, RuntimeError, ValueError) as e:
+        # Full tracebacks only when debugging
+        logger.error("Command failed: %s", e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         sys.exit(1)
 
 if __name__ == "__main__":
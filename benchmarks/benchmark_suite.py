@@ -7,10 +7,26 @@ These benchmarks track performance over time across different commits.
 """
 
 import asyncio
+import inspect
 from pixeltracker import BasicTrackingScanner, EnhancedTrackingScanner, ConfigManager
 from pixeltracker.services.parser import HTMLParserService
 
 
+def tracking_pixels_html(count):
+    """Return ``count`` distinct 1x1 tracking pixel tags"""
+    return "".join(
+        f'<img src="https://tracker{i}.com/pixel.gif" width="1" height="1">\n'
+        for i in range(count)
+    )
+
+
+def run_scan(scan, url):
+    """Call ``scan(url)``, driving it on an event loop only if it is async"""
+    if inspect.iscoroutinefunction(scan):
+        return asyncio.run(scan(url))
+    return scan(url)
+
+
 class ScannerBenchmarks:
     """Scanner performance benchmarks"""
     
@@ -22,19 +38,19 @@ class ScannerBenchmarks:
     
     def time_basic_scanner_scan(self):
         """Time basic scanner scan operation"""
-        return self.basic_scanner.scan_url("https://example.com")
+        return run_scan(self.basic_scanner.scan_url, "https://example.com")
     
     def time_enhanced_scanner_scan(self):
         """Time enhanced scanner scan operation"""
-        return self.enhanced_scanner.scan_url("https://example.com")
+        return run_scan(self.enhanced_scanner.scan_url, "https://example.com")
     
     def peakmem_basic_scanner_scan(self):
         """Measure peak memory usage during basic scan"""
-        return self.basic_scanner.scan_url("https://example.com")
+        return run_scan(self.basic_scanner.scan_url, "https://example.com")
     
     def peakmem_enhanced_scanner_scan(self):
         """Measure peak memory usage during enhanced scan"""
-        return self.enhanced_scanner.scan_url("https://example.com")
+        return run_scan(self.enhanced_scanner.scan_url, "https://example.com")
 
 
 class ParsingBenchmarks:
@@ -55,8 +71,9 @@ class ParsingBenchmarks:
         </html>
         """
         
-        # Complex HTML with multiple trackers
-        self.complex_html = """
+        # Complex HTML with 100 tracking pixels
+        self.complex_html = "".join([
+            """
         <!DOCTYPE html>
         <html>
         <head>
@@ -65,17 +82,14 @@ class ParsingBenchmarks:
         </head>
         <body>
             <h1>Complex Page</h1>
-        """
-        
-        # Add 100 tracking pixels
-        for i in range(100):
-            self.complex_html += f'<img src="https://tracker{i}.com/pixel.gif" width="1" height="1">\n'
-        
-        self.complex_html += """
+        """,
+            tracking_pixels_html(100),
+            """
             <script src="https://connect.facebook.net/en_US/fbevents.js"></script>
         </body>
         </html>
-        """
+        """,
+        ])
     
     def time_parse_simple_html(self):
         """Time parsing of simple HTML"""
@@ -90,6 +104,18 @@ class ParsingBenchmarks:
         return self.parser.parse(self.complex_html)
 
 
+async def scan_concurrently(scanner, count, limit=20):
+    """Scan ``count`` URLs with at most ``limit`` scans in flight"""
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def scan_one(url):
+        async with semaphore:
+            return await scanner.scan_url(url)
+    
+    tasks = [scan_one(f"https://example{i}.com") for i in range(count)]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
 class ConcurrencyBenchmarks:
     """Concurrency and scalability benchmarks"""
     
@@ -100,43 +126,19 @@ class ConcurrencyBenchmarks:
     
     def time_concurrent_scans_5(self):
         """Time 5 concurrent scans"""
-        async def scan_multiple():
-            tasks = []
-            for i in range(5):
-                tasks.append(self.scanner.scan_url(f"https://example{i}.com"))
-            return await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return asyncio.run(scan_multiple())
+        return asyncio.run(scan_concurrently(self.scanner, 5))
     
     def time_concurrent_scans_10(self):
         """Time 10 concurrent scans"""
-        async def scan_multiple():
-            tasks = []
-            for i in range(10):
-                tasks.append(self.scanner.scan_url(f"https://example{i}.com"))
-            return await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return asyncio.run(scan_multiple())
+        return asyncio.run(scan_concurrently(self.scanner, 10))
     
     def time_concurrent_scans_20(self):
         """Time 20 concurrent scans"""
-        async def scan_multiple():
-            tasks = []
-            for i in range(20):
-                tasks.append(self.scanner.scan_url(f"https://example{i}.com"))
-            return await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return asyncio.run(scan_multiple())
+        return asyncio.run(scan_concurrently(self.scanner, 20))
     
     def peakmem_concurrent_scans_20(self):
         """Measure peak memory usage during 20 concurrent scans"""
-        async def scan_multiple():
-            tasks = []
-            for i in range(20):
-                tasks.append(self.scanner.scan_url(f"https://example{i}.com"))
-            return await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return asyncio.run(scan_multiple())
+        return asyncio.run(scan_concurrently(self.scanner, 20))
 
 
 class InitializationBenchmarks:
@@ -171,21 +173,20 @@ class ScalabilityBenchmarks:
         self.parser = HTMLParserService()
         
         # Generate HTML with specified number of trackers
-        self.html = """
+        self.html = "".join([
+            """
         <!DOCTYPE html>
         <html>
         <head><title>Scalability Test</title></head>
         <body>
             <h1>Scalability Test Page</h1>
-        """
-        
-        for i in range(tracker_count):
-            self.html += f'<img src="https://tracker{i}.com/pixel.gif" width="1" height="1">\n'
-        
-        self.html += """
+        """,
+            tracking_pixels_html(tracker_count),
+            """
         </body>
         </html>
-        """
+        """,
+        ])
     
     def time_parse_variable_trackers(self, tracker_count):
         """Time parsing HTML with variable number of trackers"""
@@ -5,12 +5,49 @@ Configuration management for PixelTracker
 
 import yaml
 import json
+import os
+import copy
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader/dumper when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CDumper', yaml.Dumper)
+
+# Parsed config files keyed by absolute path, valid while (mtime, size) match
+_CONFIG_CACHE_SIZE = 100
+_config_cache: 'OrderedDict[str, Tuple[Tuple[int, int], Any]]' = OrderedDict()
+
+def _parse_config_file(config_path: str) -> Any:
+    """Parse a YAML or JSON config file, reusing the cached parse if it is unchanged
+
+    Callers get their own deep copy, so merging into it cannot alter the cache.
+    """
+    stat = os.stat(config_path)
+    key = os.path.abspath(config_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    
+    cached = _config_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        _config_cache.move_to_end(key)
+        return copy.deepcopy(cached[1])
+    
+    with open(config_path, 'r') as f:
+        if config_path.endswith('.json'):
+            parsed = json.load(f)
+        else:
+            parsed = yaml.load(f, Loader=_YAML_LOADER)
+    
+    _config_cache[key] = (stamp, parsed)
+    _config_cache.move_to_end(key)
+    if len(_config_cache) > _CONFIG_CACHE_SIZE:
+        _config_cache.popitem(last=False)
+    return copy.deepcopy(parsed)
+
 class Config:
     """Configuration manager for PixelTracker"""
     
@@ -96,14 +133,11 @@ class Config:
                 logger.warning(f"Config file {config_path} not found, using defaults")
                 return
             
-            with open(config_file, 'r') as f:
-                if config_path.endswith('.yaml') or config_path.endswith('.yml'):
-                    user_config = yaml.safe_load(f)
-                elif config_path.endswith('.json'):
-                    user_config = json.load(f)
-                else:
-                    logger.error(f"Unsupported config format: {config_path}")
-                    return
+            if not config_path.endswith(('.yaml', '.yml', '.json')):
+                logger.error(f"Unsupported config format: {config_path}")
+                return
+            
+            user_config = _parse_config_file(config_path)
             
             # Deep merge user config with defaults
             self._deep_merge(self.config, user_config)
@@ -128,7 +162,7 @@ class Config:
             
             with open(config_file, 'w') as f:
                 if config_path.endswith('.yaml') or config_path.endswith('.yml'):
-                    yaml.dump(self.config, f, default_flow_style=False, indent=2)
+                    yaml.dump(self.config, f, Dumper=_YAML_DUMPER, default_flow_style=False, indent=2)
                 elif config_path.endswith('.json'):
                     json.dump(self.config, f, indent=2)
                 else:
@@ -238,7 +272,7 @@ class Config:
         try:
             with open(config_path, 'w') as f:
                 if config_path.endswith('.yaml') or config_path.endswith('.yml'):
-                    yaml.dump(sample_config, f, default_flow_style=False, indent=2)
+                    yaml.dump(sample_config, f, Dumper=_YAML_DUMPER, default_flow_style=False, indent=2)
                 else:
                     json.dump(sample_config, f, indent=2)
             
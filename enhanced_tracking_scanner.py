@@ -10,6 +10,7 @@ import argparse
 import re
 import json
 import time
+import random
 import hashlib
 import sqlite3
 import warnings
@@ -33,13 +34,11 @@ except ImportError:
     OPTIONAL_DEPS['pandas'] = False
 
 try:
-    from sklearn.cluster import KMeans
-    from sklearn.preprocessing import StandardScaler
-    OPTIONAL_DEPS['sklearn'] = True
+    import faiss
+    OPTIONAL_DEPS['faiss'] = True
 except ImportError:
-    KMeans = None
-    StandardScaler = None
-    OPTIONAL_DEPS['sklearn'] = False
+    faiss = None
+    OPTIONAL_DEPS['faiss'] = False
 
 try:
     from transformers import pipeline
@@ -48,6 +47,15 @@ except ImportError:
     pipeline = None
     OPTIONAL_DEPS['transformers'] = False
 
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    OPTIONAL_DEPS['optimum'] = True
+except ImportError:
+    ORTModelForSequenceClassification = ORTQuantizer = AutoQuantizationConfig = AutoTokenizer = None
+    OPTIONAL_DEPS['optimum'] = False
+
 try:
     import tensorflow as tf
     OPTIONAL_DEPS['tensorflow'] = True
@@ -62,6 +70,65 @@ except ImportError:
     torch = None
     OPTIONAL_DEPS['torch'] = False
 
+try:
+    import orjson
+    OPTIONAL_DEPS['orjson'] = True
+except ImportError:
+    orjson = None
+    OPTIONAL_DEPS['orjson'] = False
+
+try:
+    import hyperscan
+    OPTIONAL_DEPS['hyperscan'] = True
+except ImportError:
+    hyperscan = None
+    OPTIONAL_DEPS['hyperscan'] = False
+
+# google-re2 guarantees linear-time matching; stdlib re is the fallback
+try:
+    import re2
+    OPTIONAL_DEPS['re2'] = True
+except ImportError:
+    re2 = None
+    OPTIONAL_DEPS['re2'] = False
+
+try:
+    import ahocorasick
+    OPTIONAL_DEPS['ahocorasick'] = True
+except ImportError:
+    ahocorasick = None
+    OPTIONAL_DEPS['ahocorasick'] = False
+
+# selectolax parses HTML in C; BeautifulSoup remains the fallback. The
+# lexbor backend is the only one left in selectolax 1.x.
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    OPTIONAL_DEPS['selectolax'] = True
+except ImportError:
+    HTMLParser = None
+    OPTIONAL_DEPS['selectolax'] = False
+
+try:
+    import aiodns
+    OPTIONAL_DEPS['aiodns'] = True
+except ImportError:
+    aiodns = None
+    OPTIONAL_DEPS['aiodns'] = False
+
+try:
+    from playwright.async_api import async_playwright
+    OPTIONAL_DEPS['playwright'] = True
+except ImportError:
+    async_playwright = None
+    OPTIONAL_DEPS['playwright'] = False
+
+try:
+    import xxhash
+    OPTIONAL_DEPS['xxhash'] = True
+except ImportError:
+    xxhash = None
+    OPTIONAL_DEPS['xxhash'] = False
+
 import whois
 import dns.resolver
 
@@ -82,9 +149,11 @@ except ImportError:
     OPTIONAL_DEPS['tracker_database'] = False
 from urllib.parse import urlparse, parse_qs, urljoin
 from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass, fields
+from collections import Counter, OrderedDict
 from pathlib import Path
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -99,6 +168,10 @@ logger = logging.getLogger(__name__)
 @dataclass
 class TrackerInfo:
     """Data class for tracking information"""
+    # Slots keep the per-tracker footprint small; scans emit many of these
+    __slots__ = ('tracker_type', 'domain', 'source', 'category', 'risk_level',
+                 'purpose', 'first_seen', 'details')
+    
     tracker_type: str
     domain: str
     source: str
@@ -111,6 +184,9 @@ class TrackerInfo:
 @dataclass
 class ScanResult:
     """Data class for scan results"""
+    __slots__ = ('url', 'timestamp', 'trackers', 'performance_metrics',
+                 'privacy_score', 'risk_assessment')
+    
     url: str
     timestamp: str
     trackers: List[TrackerInfo]
@@ -118,34 +194,316 @@ class ScanResult:
     privacy_score: int
     risk_assessment: Dict[str, Any]
 
+_TRACKER_FIELDS = tuple(field.name for field in fields(TrackerInfo))
+
+def scan_result_to_dict(result: ScanResult) -> Dict[str, Any]:
+    """Shallow dict view of a scan result for JSON output
+
+    Unlike ``asdict`` this does not deep-copy nested values; the dict
+    shares them with ``result``.
+    """
+    return {
+        'url': result.url,
+        'timestamp': result.timestamp,
+        'trackers': [
+            {name: getattr(tracker, name) for name in _TRACKER_FIELDS}
+            for tracker in result.trackers
+        ],
+        'performance_metrics': result.performance_metrics,
+        'privacy_score': result.privacy_score,
+        'risk_assessment': result.risk_assessment
+    }
+
+def scan_result_hash(result: ScanResult) -> str:
+    """Fingerprint of a result's URL and trackers, used to spot unchanged rescans
+
+    The hash only deduplicates history rows, so the non-cryptographic XXH3
+    is used when available; SHA-256 is the fallback.
+    """
+    fingerprint = ''.join(
+        f"\0{tracker.tracker_type}\0{tracker.domain}\0{tracker.source}"
+        for tracker in result.trackers
+    )
+    data = (result.url + fingerprint).encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.sha256(data).hexdigest()
+
+# Advanced tracking techniques: (group name, pattern, TrackerInfo fields, details).
+# The patterns are fused into one alternation so each page is scanned once.
+ADVANCED_TRACKING_SIGNATURES = [
+    ('canvas', r'canvas\.toDataURL|getContext\(["\']2d["\']\)', {
+        'tracker_type': 'fingerprinting',
+        'source': 'canvas_fingerprinting',
+        'category': 'privacy_invasion',
+        'risk_level': 'high',
+        'purpose': 'device_fingerprinting'
+    }, {'method': 'canvas_fingerprinting'}),
+    ('webrtc', r'RTCPeerConnection|webkitRTCPeerConnection', {
+        'tracker_type': 'webrtc_leak',
+        'source': 'webrtc_detection',
+        'category': 'privacy_invasion',
+        'risk_level': 'high',
+        'purpose': 'ip_leak'
+    }, {'method': 'webrtc_stun'}),
+    ('font', r'@font-face|fontface|measureText', {
+        'tracker_type': 'fingerprinting',
+        'source': 'font_fingerprinting',
+        'category': 'privacy_invasion',
+        'risk_level': 'medium',
+        'purpose': 'font_fingerprinting'
+    }, {'method': 'font_enumeration'}),
+]
+
+# RE2 has no IGNORECASE flag, so case-insensitivity is set inline for both engines
+_regex_engine = re2 or re
+_ADVANCED_TRACKING_RE = _regex_engine.compile(
+    '(?i)' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern, _, _ in ADVANCED_TRACKING_SIGNATURES)
+)
+
+# Query parameters that mark a request as tracked
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', '_ga', 'mc_eid')
+_TRACKING_PARAM_RE = re.compile('|'.join(re.escape(param) for param in TRACKING_PARAMS))
+
+PIXEL_EXTENSIONS = ('.gif', '.png', '.jpg')
+
+# Responses worth retrying, and the backoff schedule for retries
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = retry_at.timestamp() - time.time()
+    return min(max(seconds, 0.0), RETRY_MAX_DELAY)
+
+# Response headers kept in performance metrics
+RECORDED_RESPONSE_HEADERS = ('content-type', 'content-encoding', 'server', 'x-powered-by', 'set-cookie')
+
+# Privacy score deductions per tracker
+RISK_SCORE_DEDUCTIONS = {'high': 15, 'medium': 8, 'low': 3}
+CATEGORY_SCORE_DEDUCTIONS = {'advertising': 10, 'social_advertising': 10, 'privacy_invasion': 20}
+
+def _compile_hyperscan_db(signatures):
+    """Compile signatures into a Hyperscan block-mode database (ids index signatures)"""
+    count = len(signatures)
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[pattern.encode() for _, pattern, _, _ in signatures],
+        ids=list(range(count)),
+        elements=count,
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * count
+    )
+    return db
+
+# Hyperscan matches every signature in one SIMD-accelerated DFA pass
+_ADVANCED_TRACKING_HS = _compile_hyperscan_db(ADVANCED_TRACKING_SIGNATURES) if hyperscan else None
+
+def find_advanced_techniques(content: str) -> Set[str]:
+    """Return the names of the advanced tracking signatures present in content"""
+    found = set()
+    
+    if _ADVANCED_TRACKING_HS is not None:
+        def on_match(signature_id, start, end, flags, context):
+            found.add(ADVANCED_TRACKING_SIGNATURES[signature_id][0])
+        
+        _ADVANCED_TRACKING_HS.scan(content.encode('utf-8', 'replace'),
+                                   match_event_handler=on_match)
+        return found
+    
+    # Stop the fused regex scan once every technique has been seen
+    for match in _ADVANCED_TRACKING_RE.finditer(content):
+        found.add(match.lastgroup)
+        if len(found) == len(ADVANCED_TRACKING_SIGNATURES):
+            break
+    return found
+
+class DNSCache:
+    """Process-wide LRU cache of A records
+
+    Shared trackers recur across scanned sites, so each domain is resolved
+    once per process; concurrent lookups of the same domain share a query.
+    """
+    
+    def __init__(self, maxsize: int = 8192):
+        self.maxsize = maxsize
+        self._records: 'OrderedDict[str, Tuple[str, ...]]' = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+    
+    async def resolve(self, domain: str, resolver=None) -> Tuple[str, ...]:
+        """Return the A records for domain, using aiodns ``resolver`` if given"""
+        records = self._records.get(domain)
+        if records is not None:
+            self._records.move_to_end(domain)
+            return records
+        
+        pending = self._pending.get(domain)
+        if pending is None:
+            pending = asyncio.ensure_future(self._lookup(domain, resolver))
+            self._pending[domain] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(domain, None))
+        # Shielded so one cancelled caller does not cancel the shared query
+        return await asyncio.shield(pending)
+    
+    async def _lookup(self, domain: str, resolver) -> Tuple[str, ...]:
+        if resolver is not None:
+            records = tuple(record.host for record in await resolver.query(domain, 'A'))
+        else:
+            loop = asyncio.get_running_loop()
+            answer = await loop.run_in_executor(None, dns.resolver.resolve, domain)
+            records = tuple(str(record) for record in answer)
+        
+        self._records[domain] = records
+        if len(self._records) > self.maxsize:
+            self._records.popitem(last=False)
+        return records
+
+dns_cache = DNSCache()
+
+def iter_external_scripts(content: str):
+    """Yield (src, outer_html) for each <script src=...> in the page
+
+    ``outer_html`` is a zero-argument callable so markup is only
+    serialized for the scripts that turn out to be trackers.
+    """
+    if HTMLParser is not None:
+        for node in HTMLParser(content).css('script[src]'):
+            yield node.attributes.get('src') or '', lambda node=node: node.html
+    else:
+        soup = BeautifulSoup(content, 'html.parser')
+        for script in soup.find_all('script', src=True):
+            yield script.get('src', ''), lambda script=script: str(script)
+
 class MLModels:
     """Machine learning models for advanced analysis"""
     
+    SENTIMENT_MODEL = 'distilbert-base-uncased-finetuned-sst-2-english'
+    ONNX_CACHE_DIR = Path.home() / '.cache' / 'pixeltracker' / 'onnx-sst2-int8'
+    
     def __init__(self):
-        if pipeline:
-            self.text_classifier = pipeline('sentiment-analysis')
-        else:
-            self.text_classifier = None
+        self._text_classifier = None
+        self._text_classifier_loaded = False
         self.domain_embedding_model = self.load_domain_embedding_model()
+    
+    @property
+    def text_classifier(self):
+        """The sentiment classifier, loaded on first use"""
+        if not self._text_classifier_loaded:
+            self._text_classifier = self.load_text_classifier()
+            self._text_classifier_loaded = True
+        return self._text_classifier
+    
+    def load_text_classifier(self):
+        """Load the sentiment classifier, preferring the exported int8 ONNX model
+
+        The ONNX model is only used once export_quantized_classifier has
+        written it; otherwise the PyTorch pipeline is loaded.
+        """
+        if not pipeline:
+            return None
+        quantized = self.ONNX_CACHE_DIR / 'model_quantized.onnx'
+        if ORTModelForSequenceClassification is not None and quantized.exists():
+            try:
+                model = ORTModelForSequenceClassification.from_pretrained(
+                    self.ONNX_CACHE_DIR, file_name=quantized.name
+                )
+                tokenizer = AutoTokenizer.from_pretrained(self.ONNX_CACHE_DIR)
+                return pipeline('sentiment-analysis', model=model, tokenizer=tokenizer)
+            except Exception as e:
+                logger.warning(f"ONNX classifier unavailable, using PyTorch pipeline: {e}")
+        return pipeline('sentiment-analysis', model=self.SENTIMENT_MODEL)
+    
+    @classmethod
+    def export_quantized_classifier(cls) -> Path:
+        """Export the sentiment model to ONNX and quantize it to int8 in ONNX_CACHE_DIR"""
+        if ORTModelForSequenceClassification is None:
+            raise RuntimeError("optimum[onnxruntime] is required to export the classifier")
+        cache_dir = cls.ONNX_CACHE_DIR
+        model = ORTModelForSequenceClassification.from_pretrained(cls.SENTIMENT_MODEL, export=True)
+        model.save_pretrained(cache_dir)
+        AutoTokenizer.from_pretrained(cls.SENTIMENT_MODEL).save_pretrained(cache_dir)
+        quantizer = ORTQuantizer.from_pretrained(model)
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=cache_dir, quantization_config=qconfig)
+        return cache_dir / 'model_quantized.onnx'
         
     def load_domain_embedding_model(self):
         """Load pre-trained domain embedding model"""
         # Placeholder for loading an embedding model (e.g., using transformers or FAISS)
         return None
     
-    def cluster_domains(self, domains: List[str]) -> Dict[str, List[str]]:
-        """Cluster domains based on similarity or behavior"""
-        if not np or not KMeans:
+    @staticmethod
+    def embed_domains(domains: List[str], dim: int = 64) -> 'np.ndarray':
+        """Embed domains as hashed character-trigram counts (float32)
+
+        ``dim`` must be a power of two: trigrams are packed into 24-bit
+        codes and bucketed by the top bits of a multiplicative hash.
+        """
+        if dim < 2 or dim & (dim - 1):
+            raise ValueError(f"dim must be a power of two, got {dim}")
+        shift = np.uint64(64 - (dim.bit_length() - 1))
+        embeddings = np.zeros((len(domains), dim), dtype=np.float32)
+        for i, domain in enumerate(domains):
+            raw = np.frombuffer(domain.encode(), dtype=np.uint8).astype(np.uint64)
+            if len(raw) < 3:
+                continue
+            codes = (raw[:-2] << np.uint64(16)) | (raw[1:-1] << np.uint64(8)) | raw[2:]
+            buckets = (codes * np.uint64(0x9E3779B97F4A7C15)) >> shift
+            embeddings[i] = np.bincount(buckets.astype(np.intp), minlength=dim)
+        return embeddings
+    
+    @staticmethod
+    def _lloyd_kmeans(vectors: 'np.ndarray', n_clusters: int, niter: int = 20) -> 'np.ndarray':
+        """Plain NumPy k-means for inputs too small for FAISS to train on"""
+        centroids = vectors[:n_clusters].copy()
+        labels = np.zeros(len(vectors), dtype=np.int64)
+        for _ in range(niter):
+            distances = ((vectors[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+            new_labels = distances.argmin(axis=1)
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            for k in range(n_clusters):
+                members = vectors[labels == k]
+                if len(members):
+                    centroids[k] = members.mean(axis=0)
+        return labels
+    
+    def cluster_domains(self, domains: List[str]) -> Dict[int, List[str]]:
+        """Cluster domains based on name similarity"""
+        if not np:
             logger.warning("Machine learning libraries not available for clustering")
             return {0: domains}  # Return all domains in one cluster
-            
-        embeddings = np.random.rand(len(domains), 128)  # Placeholder for embeddings
-        clustering_model = KMeans(n_clusters=5)
-        labels = clustering_model.fit_predict(embeddings)
+        if not domains:
+            return {}
+        
+        embeddings = self.embed_domains(domains)
+        n_clusters = min(5, len(domains))
+        
+        if faiss is not None and len(domains) >= 32:
+            kmeans = faiss.Kmeans(embeddings.shape[1], n_clusters, niter=20, verbose=False)
+            kmeans.train(embeddings)
+            _, assignments = kmeans.index.search(embeddings, 1)
+            labels = assignments.ravel()
+        else:
+            labels = self._lloyd_kmeans(embeddings, n_clusters)
         
         clusters = {}
-        for i, domain in enumerate(domains):
-            clusters.setdefault(labels[i], []).append(domain)
+        for domain, label in zip(domains, labels.tolist()):
+            clusters.setdefault(label, []).append(domain)
         
         return clusters
 
@@ -159,51 +517,82 @@ class MLModels:
 
     def detect_anomalies(self, metrics: Dict[str, float]) -> bool:
         """Detect anomalies in performance metrics"""
-        if not StandardScaler or not np:
+        if not np or not metrics:
             return False
-        standard_metrics = StandardScaler().fit_transform(np.array(list(metrics.values())).reshape(-1, 1))
-        anomalies = standard_metrics > 2  # Placeholder for anomaly detection logic
-        return any(anomalies)
+        values = np.fromiter(metrics.values(), dtype=np.float64, count=len(metrics))
+        # z-scores; a constant series has no outliers
+        sigma = values.std() or 1.0
+        return bool(((values - values.mean()) / sigma > 2).any())  # Placeholder for anomaly detection logic
 
 
 class TrackerDatabase:
     """Database for tracking patterns and intelligence"""
     
+    INSERT_SCAN_HISTORY = (
+        "INSERT INTO scan_history (url, scan_timestamp, tracker_count, privacy_score, result_hash) "
+        "VALUES (?, ?, ?, ?, ?)"
+    )
+    
     def __init__(self, db_path: str = "tracker_intelligence.db"):
         self.db_path = db_path
         self.init_database()
         self.load_tracker_intelligence()
+        self.build_domain_matcher()
     
     def init_database(self):
-        """Initialize SQLite database for tracker intelligence"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tracker_patterns (
-                id INTEGER PRIMARY KEY,
-                domain TEXT UNIQUE,
-                category TEXT,
-                risk_level TEXT,
-                purpose TEXT,
-                patterns TEXT,  -- JSON array of patterns
-                last_updated TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS scan_history (
-                id INTEGER PRIMARY KEY,
-                url TEXT,
-                scan_timestamp TEXT,
-                tracker_count INTEGER,
-                privacy_score INTEGER,
-                result_hash TEXT
-            )
-        ''')
+        """Initialize SQLite database for tracker intelligence
+
+        A single connection is kept open for the scanner's lifetime, in WAL
+        mode so readers are not blocked while scan history is written.
+        """
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA mmap_size=268435456')
         
-        conn.commit()
-        conn.close()
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS tracker_patterns (
+                    id INTEGER PRIMARY KEY,
+                    domain TEXT UNIQUE,
+                    category TEXT,
+                    risk_level TEXT,
+                    purpose TEXT,
+                    patterns TEXT,  -- JSON array of patterns
+                    last_updated TEXT
+                )
+            ''')
+            
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS scan_history (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT,
+                    scan_timestamp TEXT,
+                    tracker_count INTEGER,
+                    privacy_score INTEGER,
+                    result_hash TEXT
+                )
+            ''')
+    
+    def record_scans(self, results: List['ScanResult']):
+        """Append scan results to scan_history in one transaction"""
+        rows = [
+            (result.url, result.timestamp, len(result.trackers), result.privacy_score,
+             scan_result_hash(result))
+            for result in results
+        ]
+        if rows:
+            if self._conn is None:
+                self.init_database()
+            with self._conn:
+                self._conn.executemany(self.INSERT_SCAN_HISTORY, rows)
+    
+    def close(self):
+        """Close the database connection; a later write reopens it"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
     
     def load_tracker_intelligence(self):
         """Load comprehensive tracker intelligence"""
@@ -226,6 +615,23 @@ class TrackerDatabase:
             
             # Add more comprehensive intelligence...
         }
+    
+    def build_domain_matcher(self):
+        """Build an Aho-Corasick automaton over all known tracker domains"""
+        self.domain_automaton = None
+        if ahocorasick is None:
+            return
+        automaton = ahocorasick.Automaton()
+        for domain in self.tracker_intelligence:
+            automaton.add_word(domain, domain)
+        automaton.make_automaton()
+        self.domain_automaton = automaton
+    
+    def find_known_domains(self, content: str) -> Set[str]:
+        """Return the known tracker domains mentioned anywhere in content"""
+        if self.domain_automaton is not None:
+            return {domain for _, domain in self.domain_automaton.iter(content)}
+        return {domain for domain in self.tracker_intelligence if domain in content}
 
 class EnhancedTrackingScanner:
     """Enhanced tracking scanner with advanced capabilities"""
@@ -236,6 +642,12 @@ class EnhancedTrackingScanner:
         self.ml_models = MLModels()
         self.session_cache = {}
         self.performance_metrics = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._playwright = None
+        self._browser = None
+        self._browser_slots: Optional[asyncio.Semaphore] = None
+        # Monotonic time before which a rate-limited host is not contacted
+        self._host_ready_at: Dict[str, float] = {}
         
         # Advanced detection patterns
         self.advanced_patterns = {
@@ -265,12 +677,71 @@ class EnhancedTrackingScanner:
             ]
         }
     
+    async def __aenter__(self) -> 'EnhancedTrackingScanner':
+        if self._session is None:
+            self._session = self._create_session()
+        if self.config['enable_javascript'] and self._browser is None:
+            await self._launch_browser()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session, headless browser and database"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self.tracker_db.close()
+    
+    async def _launch_browser(self) -> None:
+        """Start one headless Chromium that every JavaScript scan opens contexts in"""
+        if async_playwright is None:
+            logger.warning("Playwright not available. JavaScript scanning will be skipped.")
+            return
+        try:
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+        except Exception as e:
+            logger.warning(f"Failed to launch headless browser: {e}")
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            return
+        self._browser_slots = asyncio.Semaphore(self.config['concurrent_requests'])
+    
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create an HTTP session whose connection pool is shared by all scans"""
+        connector = aiohttp.TCPConnector(
+            limit=self.config['concurrent_requests'],
+            limit_per_host=4,
+            # aiodns-backed resolution, cached for the life of the session
+            resolver=aiohttp.AsyncResolver() if aiodns else None,
+            ttl_dns_cache=600,
+            # Idle connections outlive retry backoffs and Retry-After waits
+            keepalive_timeout=30,
+            enable_cleanup_closed=True
+        )
+        return aiohttp.ClientSession(
+            headers=self.config['headers'],
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config['request_timeout'])
+        )
+    
     def load_config(self, config_path: Optional[str]) -> Dict[str, Any]:
         """Load configuration from file or use defaults"""
         default_config = {
             'concurrent_requests': 10,
             'request_timeout': 30,
-            'enable_javascript': True,
+            'max_retries': 3,
+            'url_timeout': 120,
+            'enable_javascript': False,
             'user_agents': [
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -293,120 +764,150 @@ class EnhancedTrackingScanner:
         return default_config
     
     async def scan_with_javascript(self, url: str) -> Dict[str, Any]:
-        """Scan URL with JavaScript execution using headless browser"""
-        try:
-            # Use playwright or selenium for JS execution
-            # For now, simulate with subprocess call to a JS runner
-            temp_script = f"""
-                const puppeteer = require('puppeteer');
+        """Scan URL with JavaScript execution using headless browser
+
+        Each URL gets a fresh browser context in the shared browser, so
+        cookies and storage do not leak between scans. Without a browser
+        (Playwright missing, or not inside ``async with scanner``) the scan
+        is skipped.
+        """
+        if self._browser is None:
+            return {'dynamic_content': False, 'js_trackers': []}
+        
+        async with self._browser_slots:
+            context = None
+            try:
+                context = await self._browser.new_context(
+                    user_agent=self.config['user_agents'][0]
+                )
+                page = await context.new_page()
                 
-                (async () => {{
-                    const browser = await puppeteer.launch({{headless: true}});
-                    const page = await browser.newPage();
-                    
-                    // Intercept network requests
-                    const requests = [];
-                    await page.setRequestInterception(true);
-                    page.on('request', request => {{
-                        requests.push({{
-                            url: request.url(),
-                            resourceType: request.resourceType(),
-                            headers: request.headers()
-                        }});
-                        request.continue();
-                    }});
+                # Record network requests made by the page
+                requests = []
+                page.on('request', lambda request: requests.append({
+                    'url': request.url,
+                    'resourceType': request.resource_type,
+                    'headers': request.headers
+                }))
+                
+                await page.goto(url, wait_until='networkidle',
+                                timeout=self.config['request_timeout'] * 1000)
+                
+                # Extract dynamic content
+                dynamic_trackers = await page.evaluate('''() => ({
+                    localStorage: Object.keys(localStorage),
+                    sessionStorage: Object.keys(sessionStorage),
+                    cookies: document.cookie,
+                    scripts: Array.from(document.scripts).map(s => s.src),
+                    iframes: Array.from(document.querySelectorAll('iframe')).map(i => i.src)
+                })''')
+            except Exception as e:
+                logger.warning(f"JavaScript execution failed for {url}: {e}")
+                return {'dynamic_content': False, 'js_trackers': []}
+            finally:
+                if context is not None:
+                    await context.close()
+        
+        known_domains = self.tracker_db.tracker_intelligence
+        js_trackers = [
+            request['url'] for request in requests
+            if any(domain in urlparse(request['url']).netloc for domain in known_domains)
+        ]
+        
+        return {
+            'dynamic_content': True,
+            'js_trackers': js_trackers,
+            'requests': requests,
+            'dynamic_trackers': dynamic_trackers
+        }
+    
+    async def fetch_with_performance_metrics(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        """Fetch URL with detailed performance metrics
+
+        Connection errors and 429/5xx responses are retried with jittered
+        exponential backoff. A Retry-After header holds back every request
+        to that host until it expires.
+        """
+        host = urlparse(url).netloc
+        max_retries = self.config['max_retries']
+        start_time = time.time()
+        
+        for attempt in range(max_retries + 1):
+            await self._wait_for_host(host)
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.config['request_timeout'])) as response:
+                    if response.status in RETRY_STATUSES and attempt < max_retries:
+                        delay = parse_retry_after(response.headers.get('Retry-After'))
+                        if delay is None:
+                            delay = backoff_delay(attempt)
+                        self._host_ready_at[host] = time.monotonic() + delay
+                        continue
                     
-                    await page.goto('{url}', {{waitUntil: 'networkidle2'}});
+                    # aiohttp falls back to its own charset detection when the
+                    # Content-Type header does not name one
+                    content = await response.text(errors='replace')
                     
-                    // Extract dynamic content
-                    const dynamicTrackers = await page.evaluate(() => {{
-                        return {{
-                            localStorage: Object.keys(localStorage),
-                            sessionStorage: Object.keys(sessionStorage),
-                            cookies: document.cookie,
-                            scripts: Array.from(document.scripts).map(s => s.src),
-                            iframes: Array.from(document.iframes).map(i => i.src)
-                        }};
-                    }});
+                    metrics = {
+                        'response_time': time.time() - start_time,
+                        'status_code': response.status,
+                        'content_length': len(content),
+                        'headers': {key: response.headers[key]
+                                    for key in RECORDED_RESPONSE_HEADERS if key in response.headers},
+                        'redirects': len(response.history),
+                        'final_url': str(response.url),
+                        'attempts': attempt + 1
+                    }
                     
-                    await browser.close();
-                    console.log(JSON.stringify({{requests, dynamicTrackers}}));
-                }})();
-            """
-            
-            # This would require puppeteer/playwright setup
-            # For now, return placeholder
-            return {'dynamic_content': True, 'js_trackers': []}
+                    return {'content': content, 'metrics': metrics}
             
-        except Exception as e:
-            logger.warning(f"JavaScript execution failed for {url}: {e}")
-            return {'dynamic_content': False, 'js_trackers': []}
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt < max_retries:
+                    logger.debug(f"Retrying {url} after error: {e}")
+                    await asyncio.sleep(backoff_delay(attempt))
+                    continue
+                logger.error(f"Failed to fetch {url}: {e}")
+                return {'content': '', 'metrics': {'error': str(e)}}
+            except Exception as e:
+                logger.error(f"Failed to fetch {url}: {e}")
+                return {'content': '', 'metrics': {'error': str(e)}}
     
-    async def fetch_with_performance_metrics(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
-        """Fetch URL with detailed performance metrics"""
-        start_time = time.time()
-        
-        try:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.config['request_timeout'])) as response:
-                content = await response.text()
-                
-                metrics = {
-                    'response_time': time.time() - start_time,
-                    'status_code': response.status,
-                    'content_length': len(content),
-                    'headers': dict(response.headers),
-                    'redirects': len(response.history),
-                    'final_url': str(response.url)
-                }
-                
-                return {'content': content, 'metrics': metrics}
-                
-        except Exception as e:
-            logger.error(f"Failed to fetch {url}: {e}")
-            return {'content': '', 'metrics': {'error': str(e)}}
+    async def _wait_for_host(self, host: str) -> None:
+        """Sleep until a host's Retry-After window, if any, has passed
+
+        Expired windows are dropped, so the table only holds hosts that are
+        currently backing off.
+        """
+        ready_at = self._host_ready_at.get(host)
+        if ready_at is None:
+            return
+        delay = ready_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # Keep the entry if a newer Retry-After replaced it while sleeping
+        if self._host_ready_at.get(host) == ready_at:
+            del self._host_ready_at[host]
     
     def detect_advanced_tracking(self, content: str, url: str) -> List[TrackerInfo]:
         """Detect advanced tracking techniques"""
         trackers = []
         
-        # Canvas fingerprinting detection
-        if re.search(r'canvas\.toDataURL|getContext\(["\']2d["\']\)', content, re.IGNORECASE):
-            trackers.append(TrackerInfo(
-                tracker_type='fingerprinting',
-                domain=urlparse(url).netloc,
-                source='canvas_fingerprinting',
-                category='privacy_invasion',
-                risk_level='high',
-                purpose='device_fingerprinting',
-                first_seen=datetime.now().isoformat(),
-                details={'method': 'canvas_fingerprinting'}
-            ))
+        # One pass over the content finds every technique
+        found = find_advanced_techniques(content)
+        if not found:
+            return trackers
         
-        # WebRTC leak detection
-        if re.search(r'RTCPeerConnection|webkitRTCPeerConnection', content, re.IGNORECASE):
-            trackers.append(TrackerInfo(
-                tracker_type='webrtc_leak',
-                domain=urlparse(url).netloc,
-                source='webrtc_detection',
-                category='privacy_invasion',
-                risk_level='high',
-                purpose='ip_leak',
-                first_seen=datetime.now().isoformat(),
-                details={'method': 'webrtc_stun'}
-            ))
+        # Same for every tracker found on this page
+        netloc = urlparse(url).netloc
+        now_iso = datetime.now().isoformat()
         
-        # Font fingerprinting
-        if re.search(r'@font-face|fontface|measureText', content, re.IGNORECASE):
-            trackers.append(TrackerInfo(
-                tracker_type='fingerprinting',
-                domain=urlparse(url).netloc,
-                source='font_fingerprinting',
-                category='privacy_invasion',
-                risk_level='medium',
-                purpose='font_fingerprinting',
-                first_seen=datetime.now().isoformat(),
-                details={'method': 'font_enumeration'}
-            ))
+        for name, _, tracker_fields, details in ADVANCED_TRACKING_SIGNATURES:
+            if name in found:
+                trackers.append(TrackerInfo(
+                    domain=netloc,
+                    first_seen=now_iso,
+                    details=dict(details),
+                    **tracker_fields
+                ))
         
         return trackers
     
@@ -414,6 +915,7 @@ class EnhancedTrackingScanner:
         """Analyze network request patterns for tracking"""
         trackers = []
         suspicious_patterns = []
+        now_iso = datetime.now().isoformat()
         
         for request in requests:
             url = request.get('url', '')
@@ -421,14 +923,13 @@ class EnhancedTrackingScanner:
             
             # Check for tracking parameters
             query_params = parse_qs(parsed_url.query)
-            tracking_params = ['utm_', 'fbclid', 'gclid', '_ga', 'mc_eid']
             
             for param in query_params:
-                if any(tp in param.lower() for tp in tracking_params):
+                if _TRACKING_PARAM_RE.search(param.lower()):
                     suspicious_patterns.append(f"tracking_parameter:{param}")
             
             # Check for pixel-like requests (small images)
-            if parsed_url.path.endswith(('.gif', '.png', '.jpg')) and 'pixel' in url.lower():
+            if parsed_url.path.endswith(PIXEL_EXTENSIONS) and 'pixel' in url.lower():
                 trackers.append(TrackerInfo(
                     tracker_type='tracking_pixel',
                     domain=parsed_url.netloc,
@@ -436,76 +937,94 @@ class EnhancedTrackingScanner:
                     category='analytics',
                     risk_level='medium',
                     purpose='page_tracking',
-                    first_seen=datetime.now().isoformat(),
+                    first_seen=now_iso,
                     details={'url': url, 'method': 'pixel_request'}
                 ))
         
         return trackers
     
-    async def scan_url_comprehensive(self, url: str) -> ScanResult:
-        """Comprehensive scan of a single URL"""
+    async def scan_url_comprehensive(self, url: str,
+                                     session: Optional[aiohttp.ClientSession] = None) -> ScanResult:
+        """Comprehensive scan of a single URL
+
+        Uses ``session`` or the scanner's shared session; a standalone call
+        outside ``async with scanner`` gets a temporary session.
+        """
+        session = session or self._session
+        if session is None:
+            async with self._create_session() as session:
+                return await self.scan_url_comprehensive(url, session)
+        
         start_time = time.time()
         
-        async with aiohttp.ClientSession(
-            headers=self.config['headers'],
-            timeout=aiohttp.ClientTimeout(total=self.config['request_timeout'])
-        ) as session:
-            
-            # Fetch with metrics
-            result = await self.fetch_with_performance_metrics(session, url)
-            content = result['content']
-            metrics = result['metrics']
-            
-            # Basic tracking detection (from original scanner)
-            basic_trackers = self.detect_basic_tracking(content, url)
-            
-            # Advanced tracking detection
-            advanced_trackers = self.detect_advanced_tracking(content, url)
-            
-            # JavaScript execution (if enabled)
-            js_result = {}
-            if self.config['enable_javascript']:
-                js_result = await self.scan_with_javascript(url)
-            
-            # Combine all trackers
-            all_trackers = basic_trackers + advanced_trackers
-            
-            # Calculate privacy score
-            privacy_score = self.calculate_privacy_score(all_trackers, metrics)
-            
-            # Risk assessment
-            risk_assessment = self.assess_privacy_risks(all_trackers, url)
-            
-            # Performance metrics
-            performance_metrics = {
-                **metrics,
-                'scan_duration': time.time() - start_time,
-                'tracker_count': len(all_trackers),
-                'js_enabled': self.config['enable_javascript']
-            }
-            
-            return ScanResult(
-                url=url,
-                timestamp=datetime.now().isoformat(),
-                trackers=all_trackers,
-                performance_metrics=performance_metrics,
-                privacy_score=privacy_score,
-                risk_assessment=risk_assessment
-            )
+        # Fetch with metrics
+        result = await self.fetch_with_performance_metrics(session, url)
+        content = result['content']
+        metrics = result['metrics']
+        
+        # Basic tracking detection (from original scanner)
+        basic_trackers = self.detect_basic_tracking(content, url)
+        
+        # Advanced tracking detection
+        advanced_trackers = self.detect_advanced_tracking(content, url)
+        
+        # JavaScript execution (if enabled)
+        js_result = {}
+        if self.config['enable_javascript']:
+            js_result = await self.scan_with_javascript(url)
+        
+        # Combine all trackers
+        all_trackers = basic_trackers + advanced_trackers
+        if js_result.get('dynamic_content'):
+            all_trackers += self.detect_javascript_tracking(js_result, basic_trackers)
+        
+        # Calculate privacy score
+        privacy_score = self.calculate_privacy_score(all_trackers, metrics)
+        
+        # Risk assessment
+        risk_assessment = self.assess_privacy_risks(all_trackers, url)
+        
+        # Performance metrics
+        performance_metrics = {
+            **metrics,
+            'scan_duration': time.time() - start_time,
+            'tracker_count': len(all_trackers),
+            'js_enabled': self.config['enable_javascript'],
+            'js_requests': len(js_result.get('requests', [])),
+            'js_tracker_count': len(js_result.get('js_trackers', []))
+        }
+        
+        return ScanResult(
+            url=url,
+            timestamp=datetime.now().isoformat(),
+            trackers=all_trackers,
+            performance_metrics=performance_metrics,
+            privacy_score=privacy_score,
+            risk_assessment=risk_assessment
+        )
     
     def detect_basic_tracking(self, content: str, url: str) -> List[TrackerInfo]:
         """Basic tracking detection (simplified from original)"""
         trackers = []
-        soup = BeautifulSoup(content, 'html.parser')
+        tracker_intelligence = self.tracker_db.tracker_intelligence
+        
+        # A script can only match a domain that appears in the raw page, so
+        # pages without any known domain skip HTML parsing altogether
+        if not self.tracker_db.find_known_domains(content):
+            return trackers
+        
+        now_iso = datetime.now().isoformat()
+        seen_domains = set()
         
-        # Find tracking scripts
-        scripts = soup.find_all('script')
-        for script in scripts:
-            src = script.get('src', '')
+        # Find tracking scripts, reporting each tracker domain once per page
+        for src, outer_html in iter_external_scripts(content):
             if src:
                 domain = urlparse(src).netloc
-                if domain in self.tracker_db.tracker_intelligence:
-                    intel = self.tracker_db.tracker_intelligence[domain]
+                if domain in seen_domains:
+                    continue
+                intel = tracker_intelligence.get(domain)
+                if intel is not None:
+                    seen_domains.add(domain)
                     trackers.append(TrackerInfo(
                         tracker_type='javascript',
                         domain=domain,
@@ -513,96 +1032,170 @@ class EnhancedTrackingScanner:
                         category=intel['category'],
                         risk_level=intel['risk'],
                         purpose=intel['purpose'],
-                        first_seen=datetime.now().isoformat(),
-                        details={'element': str(script)[:200]}
+                        first_seen=now_iso,
+                        details={'element': outer_html()[:200]}
                     ))
         
         return trackers
     
+    def detect_javascript_tracking(self, js_result: Dict[str, Any],
+                                   static_trackers: List[TrackerInfo]) -> List[TrackerInfo]:
+        """Trackers seen only while the page ran in the headless browser
+
+        Known tracker domains the page requested are reported once each,
+        skipping domains the static HTML scan already found. Pixel-like
+        requests go through analyze_request_patterns.
+        """
+        tracker_intelligence = self.tracker_db.tracker_intelligence
+        seen_domains = {tracker.domain for tracker in static_trackers}
+        now_iso = datetime.now().isoformat()
+        trackers = []
+        
+        for request_url in js_result.get('js_trackers', []):
+            netloc = urlparse(request_url).netloc
+            if netloc in seen_domains:
+                continue
+            seen_domains.add(netloc)
+            domain = next(d for d in tracker_intelligence if d in netloc)
+            intel = tracker_intelligence[domain]
+            trackers.append(TrackerInfo(
+                tracker_type='dynamic_request',
+                domain=netloc,
+                source=request_url,
+                category=intel['category'],
+                risk_level=intel['risk'],
+                purpose=intel['purpose'],
+                first_seen=now_iso,
+                details={'method': 'javascript_execution'}
+            ))
+        
+        trackers.extend(self.analyze_request_patterns(js_result.get('requests', [])))
+        return trackers
+    
     def calculate_privacy_score(self, trackers: List[TrackerInfo], metrics: Dict[str, Any]) -> int:
         """Calculate comprehensive privacy score"""
-        base_score = 100
+        # Deduct points based on tracker risk levels and categories
+        deductions = sum(
+            RISK_SCORE_DEDUCTIONS.get(tracker.risk_level, 0) +
+            CATEGORY_SCORE_DEDUCTIONS.get(tracker.category, 0)
+            for tracker in trackers
+        )
+        return max(0, 100 - deductions)
+    
+    async def perform_domain_analysis(self, urls: List[str]) -> Dict[str, Any]:
+        """Perform additional domain analysis and WHOIS lookups
+
+        Each distinct domain is looked up once, and lookups for different
+        domains run concurrently.
+        """
+        domains = list(dict.fromkeys(urlparse(url).netloc for url in urls))
+        semaphore = asyncio.Semaphore(self.config['concurrent_requests'])
+        resolver = aiodns.DNSResolver() if aiodns else None
         
-        # Deduct points based on tracker types and risk levels
-        for tracker in trackers:
-            if tracker.risk_level == 'high':
-                base_score -= 15
-            elif tracker.risk_level == 'medium':
-                base_score -= 8
-            elif tracker.risk_level == 'low':
-                base_score -= 3
-            
-            # Additional deductions for certain categories
-            if tracker.category in ['advertising', 'social_advertising']:
-                base_score -= 10
-            elif tracker.category == 'privacy_invasion':
-                base_score -= 20
-        
-        return max(0, base_score)
-    
-    def perform_domain_analysis(self, urls: List[str]) -> Dict[str, Any]:
-        """Perform additional domain analysis and WHOIS lookups"""
-        domain_info = {}
-        for url in urls:
-            try:
-                domain = urlparse(url).netloc
-                whois_info = whois.whois(domain)
-                dns_info = dns.resolver.resolve(domain)
-                domain_info[domain] = {
-                    'whois': whois_info,
-                    'dns': [str(record) for record in dns_info]
-                }
-            except Exception as e:
-                logger.warning(f"Failed domain analysis for {url}: {e}")
-                domain_info[domain] = {'error': str(e)}
-        return domain_info
+        async def analyze(domain):
+            async with semaphore:
+                return await self._analyze_domain(domain, resolver)
+        
+        results = await asyncio.gather(*(analyze(domain) for domain in domains))
+        return dict(zip(domains, results))
+    
+    async def _analyze_domain(self, domain: str, resolver) -> Dict[str, Any]:
+        """WHOIS and DNS lookups for one domain, run concurrently"""
+        loop = asyncio.get_running_loop()
+        try:
+            # python-whois only has a blocking API, so it runs in a thread
+            whois_lookup = loop.run_in_executor(None, whois.whois, domain)
+            dns_records, whois_info = await asyncio.gather(
+                dns_cache.resolve(domain, resolver), whois_lookup
+            )
+            return {
+                'whois': whois_info,
+                'dns': list(dns_records)
+            }
+        except Exception as e:
+            logger.warning(f"Failed domain analysis for {domain}: {e}")
+            return {'error': str(e)}
 
     def assess_privacy_risks(self, trackers: List[TrackerInfo], url: str) -> Dict[str, Any]:
         """Comprehensive privacy risk assessment"""
         risks = {
             'overall_risk': 'low',
             'specific_risks': [],
-            'data_collection': [],
+            'data_collection': set(),
             'third_party_domains': set(),
             'tracking_methods': set()
         }
         
-        high_risk_count = sum(1 for t in trackers if t.risk_level == 'high')
-        medium_risk_count = sum(1 for t in trackers if t.risk_level == 'medium')
+        high_risk_count = 0
+        medium_risk_count = 0
+        has_privacy_invasion = False
         
-        # Determine overall risk
-        if high_risk_count > 3 or any(t.category == 'privacy_invasion' for t in trackers):
-            risks['overall_risk'] = 'high'
-        elif high_risk_count > 0 or medium_risk_count > 5:
-            risks['overall_risk'] = 'medium'
-        
-        # Collect specific information
+        # Count risks and collect specific information in a single pass
         for tracker in trackers:
+            if tracker.risk_level == 'high':
+                high_risk_count += 1
+            elif tracker.risk_level == 'medium':
+                medium_risk_count += 1
+            if tracker.category == 'privacy_invasion':
+                has_privacy_invasion = True
+            
             risks['third_party_domains'].add(tracker.domain)
             risks['tracking_methods'].add(tracker.tracker_type)
             
             if tracker.category == 'advertising':
-                risks['data_collection'].append('behavioral_profiling')
+                risks['data_collection'].add('behavioral_profiling')
             elif tracker.category == 'analytics':
-                risks['data_collection'].append('usage_analytics')
+                risks['data_collection'].add('usage_analytics')
+        
+        # Determine overall risk
+        if high_risk_count > 3 or has_privacy_invasion:
+            risks['overall_risk'] = 'high'
+        elif high_risk_count > 0 or medium_risk_count > 5:
+            risks['overall_risk'] = 'medium'
         
         # Convert sets to lists for JSON serialization
         risks['third_party_domains'] = list(risks['third_party_domains'])
         risks['tracking_methods'] = list(risks['tracking_methods'])
-        risks['data_collection'] = list(set(risks['data_collection']))
+        risks['data_collection'] = list(risks['data_collection'])
         
         return risks
     
     async def scan_multiple_urls(self, urls: List[str]) -> List[ScanResult]:
         """Scan multiple URLs concurrently"""
-        semaphore = asyncio.Semaphore(self.config['concurrent_requests'])
+        # All scans in a batch share one session and connection pool
+        session = self._session
+        if session is None:
+            async with self._create_session() as session:
+                return await self._scan_urls(session, urls)
+        return await self._scan_urls(session, urls)
+    
+    async def _scan_urls(self, session: aiohttp.ClientSession, urls: List[str]) -> List[ScanResult]:
+        # A fixed set of workers drains the queue, so a long URL list does
+        # not turn into one pending task per URL
+        queue = asyncio.Queue()
+        for index, url in enumerate(urls):
+            queue.put_nowait((index, url))
+        results: List[Any] = [None] * len(urls)
         
-        async def scan_with_semaphore(url):
-            async with semaphore:
-                return await self.scan_url_comprehensive(url)
+        async def worker():
+            while not queue.empty():
+                index, url = queue.get_nowait()
+                try:
+                    # Bound the whole scan, retries included, so one hung
+                    # URL cannot hold a worker indefinitely
+                    results[index] = await asyncio.wait_for(
+                        self.scan_url_comprehensive(url, session),
+                        timeout=self.config['url_timeout']
+                    )
+                except asyncio.TimeoutError:
+                    results[index] = asyncio.TimeoutError(
+                        f"scan timed out after {self.config['url_timeout']}s"
+                    )
+                except Exception as e:
+                    results[index] = e
         
-        tasks = [scan_with_semaphore(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        worker_count = min(self.config['concurrent_requests'], len(urls))
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
         
         # Filter out exceptions and log errors
         valid_results = []
@@ -612,6 +1205,12 @@ class EnhancedTrackingScanner:
             else:
                 valid_results.append(result)
         
+        # Record the whole batch in a single write
+        try:
+            self.tracker_db.record_scans(valid_results)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record scan history: {e}")
+        
         return valid_results
     
     def generate_intelligence_report(self, results: List[ScanResult]) -> Dict[str, Any]:
@@ -630,17 +1229,13 @@ class EnhancedTrackingScanner:
         }
         
         # Analyze threat intelligence
-        all_domains = set()
-        category_counts = {}
-        
-        for result in results:
-            for tracker in result.trackers:
-                all_domains.add(tracker.domain)
-                category_counts[tracker.category] = category_counts.get(tracker.category, 0) + 1
+        all_trackers = [tracker for result in results for tracker in result.trackers]
+        all_domains = {tracker.domain for tracker in all_trackers}
+        category_counts = Counter(tracker.category for tracker in all_trackers)
         
         report['threat_intelligence'] = {
             'unique_tracking_domains': len(all_domains),
-            'top_categories': dict(sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
+            'top_categories': dict(category_counts.most_common(10)),
             'most_tracked_domains': list(all_domains)[:20]
         }
         
@@ -675,6 +1270,8 @@ async def main():
     parser.add_argument('--enable-js', action='store_true', help='Enable JavaScript execution')
     parser.add_argument('--concurrent', type=int, default=10, help='Concurrent requests')
     parser.add_argument('--create-config', action='store_true', help='Create sample config file')
+    parser.add_argument('--export-classifier', action='store_true',
+                        help='Export the behavior classifier to an int8 ONNX model')
     
     args = parser.parse_args()
     
@@ -682,6 +1279,15 @@ async def main():
         create_config_file()
         return
     
+    if args.export_classifier:
+        try:
+            model_path = MLModels.export_quantized_classifier()
+        except Exception as e:
+            print(f"❌ Classifier export failed: {e}")
+            return
+        print(f"📁 Quantized classifier exported: {model_path}")
+        return
+    
     # Initialize scanner
     scanner = EnhancedTrackingScanner(args.config)
     
@@ -701,9 +1307,10 @@ async def main():
     print(f"⚙️  JavaScript execution: {'enabled' if scanner.config['enable_javascript'] else 'disabled'}")
     print(f"🔧 Concurrent requests: {scanner.config['concurrent_requests']}")
     
-    # Perform scans
+    # Perform scans over one pooled session
     start_time = time.time()
-    results = await scanner.scan_multiple_urls(urls)
+    async with scanner:
+        results = await scanner.scan_multiple_urls(urls)
     scan_duration = time.time() - start_time
     
     # Generate intelligence report
@@ -728,12 +1335,20 @@ async def main():
     # Save results
     if args.output:
         output_data = {
-            'results': [asdict(result) for result in results],
+            'results': [scan_result_to_dict(result) for result in results],
             'intelligence_report': intelligence_report
         }
         
-        with open(args.output, 'w') as f:
-            json.dump(output_data, f, indent=2, default=str)
+        if orjson is not None:
+            with open(args.output, 'wb') as f:
+                f.write(orjson.dumps(
+                    output_data,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(args.output, 'w') as f:
+                json.dump(output_data, f, indent=2, default=str)
         
         print(f"💾 Results saved to {args.output}")
 
@@ -3,7 +3,7 @@
 Export utility for the comprehensive tracker database
 """
 
-import json
+import sys
 import argparse
 from tracker_database import tracker_db
 
@@ -62,45 +62,44 @@ def export_database(format_type='json', output_file=None):
             print(summary)
     
     elif format_type == 'csv':
-        # Export as CSV for spreadsheet analysis
+        # Export as CSV for spreadsheet analysis, writing rows straight to the sink
         import csv
-        import io
         
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow([
-            'Tracker ID', 'Name', 'Category', 'Risk Level', 'Description',
-            'Domains', 'Pattern Count', 'GDPR Relevant', 'CCPA Relevant',
-            'Data Types', 'Evasion Techniques', 'First Seen'
-        ])
-        
-        # Data rows
-        for tracker_id, tracker in tracker_db.trackers.items():
+        sink = open(output_file, 'w', newline='') if output_file else sys.stdout
+        try:
+            writer = csv.writer(sink)
+            
+            # Header
             writer.writerow([
-                tracker_id,
-                tracker.name,
-                tracker.category,
-                tracker.risk_level,
-                tracker.description,
-                ';'.join(tracker.domains),
-                len(tracker.patterns),
-                tracker.gdpr_relevant,
-                tracker.ccpa_relevant,
-                ';'.join(tracker.data_types),
-                ';'.join(tracker.evasion_techniques),
-                tracker.first_seen
+                'Tracker ID', 'Name', 'Category', 'Risk Level', 'Description',
+                'Domains', 'Pattern Count', 'GDPR Relevant', 'CCPA Relevant',
+                'Data Types', 'Evasion Techniques', 'First Seen'
             ])
-        
-        csv_data = output.getvalue()
+            
+            # Data rows
+            writer.writerows(
+                [
+                    tracker_id,
+                    tracker.name,
+                    tracker.category,
+                    tracker.risk_level,
+                    tracker.description,
+                    ';'.join(tracker.domains),
+                    len(tracker.patterns),
+                    tracker.gdpr_relevant,
+                    tracker.ccpa_relevant,
+                    ';'.join(tracker.data_types),
+                    ';'.join(tracker.evasion_techniques),
+                    tracker.first_seen
+                ]
+                for tracker_id, tracker in tracker_db.trackers.items()
+            )
+        finally:
+            if output_file:
+                sink.close()
         
         if output_file:
-            with open(output_file, 'w') as f:
-                f.write(csv_data)
             print(f"✅ CSV exported to {output_file}")
-        else:
-            print(csv_data)
 
 def main():
     parser = argparse.ArgumentParser(description='Export PixelTracker Database')
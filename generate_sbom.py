@@ -5,16 +5,25 @@ SBOM (Software Bill of Materials) Generator for PixelTracker
 Generates CycloneDX format SBOM during build process.
 """
 
+import configparser
 import json
+import os
 import sys
 import subprocess
-import pkg_resources
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from importlib.metadata import distributions
+from typing import Dict, List, Any, Optional, Set, Iterator, Union
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import random
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def get_installed_packages() -> List[Dict[str, Any]]:
     """Get list of installed packages with versions"""
@@ -22,13 +31,14 @@ def get_installed_packages() -> List[Dict[str, Any]]:
     
     try:
         # Get installed packages
-        installed = [d for d in pkg_resources.working_set]
-        
-        for package in installed:
+        for dist in distributions():
+            name = dist.metadata['Name']
+            if not name:
+                continue
             packages.append({
-                'name': package.project_name,
-                'version': package.version,
-                'location': package.location
+                'name': name,
+                'version': dist.version,
+                'location': str(dist.locate_file(''))
             })
     except Exception as e:
         print(f"Warning: Could not get installed packages: {e}")
@@ -41,20 +51,22 @@ def get_git_info() -> Dict[str, Any]:
     git_info = {}
     
     try:
-        # Get current commit hash
-        result = subprocess.run(['git', 'rev-parse', 'HEAD'], 
+        # Commit hash, branch name and git directory from a single git process
+        result = subprocess.run(['git', 'rev-parse', 'HEAD', '--abbrev-ref', 'HEAD', '--git-common-dir'], 
                               capture_output=True, text=True, check=True)
-        git_info['commit'] = result.stdout.strip()
+        commit, branch, git_dir = result.stdout.splitlines()
+        git_info['commit'] = commit
+        git_info['branch'] = branch
         
-        # Get branch name
-        result = subprocess.run(['git', 'rev-parse', '--abbrev-ref', 'HEAD'], 
-                              capture_output=True, text=True, check=True)
-        git_info['branch'] = result.stdout.strip()
-        
-        # Get remote URL
-        result = subprocess.run(['git', 'config', '--get', 'remote.origin.url'], 
-                              capture_output=True, text=True, check=True)
-        git_info['url'] = result.stdout.strip()
+        # Read the remote URL from the repository config instead of asking git
+        parser = configparser.ConfigParser(strict=False, interpolation=None)
+        try:
+            parser.read(os.path.join(git_dir, 'config'))
+        except configparser.Error:
+            pass
+        url = parser.get('remote "origin"', 'url', fallback=None)
+        if url:
+            git_info['url'] = url
         
     except subprocess.CalledProcessError:
         print("Warning: Could not get git information")
@@ -64,37 +76,111 @@ def get_git_info() -> Dict[str, Any]:
     return git_info
 
 
-def calculate_file_hash(file_path: Path) -> Optional[str]:
-    """Calculate SHA-256 hash of a file"""
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def calculate_file_hash(file_path: Union[str, Path]) -> Optional[str]:
+    """Calculate SHA-256 hash of a file, reading it in fixed-size chunks"""
     try:
         with open(file_path, 'rb') as f:
-            return hashlib.sha256(f.read()).hexdigest()
+            if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            hasher = hashlib.sha256()
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                hasher.update(view[:size])
+            return hasher.hexdigest()
     except Exception:
         return None
 
 
+# Hashes from previous runs, keyed by "path:mtime_ns:size"
+SBOM_CACHE_FILE = '.sbom_cache.json'
+
+
+def load_hash_cache(cache_path: Path) -> Dict[str, str]:
+    """Load file hashes saved by a previous run"""
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hash_cache(cache_path: Path, cache: Dict[str, str]) -> None:
+    """Save file hashes for the next run"""
+    try:
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"Warning: Could not save hash cache: {e}")
+
+
+# Directories never descended into when collecting source files
+SKIPPED_DIRS = {'__pycache__', 'node_modules', 'venv', 'build', 'dist'}
+
+
+def iter_source_files(root: str, extensions: Set[str]) -> Iterator[os.DirEntry]:
+    """Yield files under root with a matching extension
+
+    Hidden and SKIPPED_DIRS directories are pruned instead of walked and
+    filtered afterwards.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIPPED_DIRS:
+                    yield from iter_source_files(entry.path, extensions)
+            elif entry.is_file() and os.path.splitext(entry.name)[1] in extensions:
+                yield entry
+
+
 def get_project_files() -> List[Dict[str, Any]]:
-    """Get project source files"""
+    """Get project source files
+
+    Files whose path, mtime and size match the hash cache are not re-read.
+    """
     files = []
     project_root = Path(__file__).parent
+    cache_path = project_root / SBOM_CACHE_FILE
+    cached_hashes = load_hash_cache(cache_path)
     
     # Common source file extensions
     source_extensions = {'.py', '.yaml', '.yml', '.json', '.txt', '.md', '.cfg', '.ini'}
     
-    for file_path in project_root.rglob('*'):
-        if (file_path.is_file() and 
-            file_path.suffix in source_extensions and
-            not any(part.startswith('.') for part in file_path.parts) and
-            '__pycache__' not in str(file_path)):
-            
-            relative_path = file_path.relative_to(project_root)
-            file_hash = calculate_file_hash(file_path)
-            
-            files.append({
-                'path': str(relative_path),
-                'size': file_path.stat().st_size,
-                'hash': file_hash
-            })
+    source_files = []
+    for entry in iter_source_files(str(project_root), source_extensions):
+        stat = entry.stat()
+        relative_path = os.path.relpath(entry.path, project_root)
+        cache_key = f"{relative_path}:{stat.st_mtime_ns}:{stat.st_size}"
+        source_files.append((entry.path, cache_key))
+        
+        files.append({
+            'path': relative_path,
+            'size': stat.st_size,
+            'hash': cached_hashes.get(cache_key)
+        })
+    
+    # hashlib releases the GIL while hashing, so threads hash files in parallel
+    stale = [i for i, file_info in enumerate(files) if file_info['hash'] is None]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        file_hashes = executor.map(calculate_file_hash, [source_files[i][0] for i in stale])
+        for i, file_hash in zip(stale, file_hashes):
+            files[i]['hash'] = file_hash
+    
+    # Rewrite the cache with only the current files
+    hash_cache = {
+        cache_key: file_info['hash']
+        for (_, cache_key), file_info in zip(source_files, files)
+        if file_info['hash']
+    }
+    save_hash_cache(cache_path, hash_cache)
     
     return files
 
@@ -107,8 +193,9 @@ def generate_cyclone_dx_sbom() -> Dict[str, Any]:
     git_info = get_git_info()
     project_files = get_project_files()
     
-    # Generate unique BOM serial number
-    bom_serial = f"urn:uuid:{uuid.uuid4()}"
+    # Generate unique, time-ordered BOM serial number. The node is a random
+    # multicast address (RFC 4122 4.5) so the host's MAC is not disclosed.
+    bom_serial = f"urn:uuid:{uuid.uuid1(node=random.getrandbits(48) | 1 << 40)}"
     
     # Create CycloneDX SBOM structure
     sbom = {
@@ -185,8 +272,12 @@ def generate_cyclone_dx_sbom() -> Dict[str, Any]:
 def save_sbom(sbom: Dict[str, Any], output_file: str = "sbom.json") -> None:
     """Save SBOM to file"""
     try:
-        with open(output_file, 'w') as f:
-            json.dump(sbom, f, indent=2)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(sbom, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(sbom, f, indent=2)
         print(f"✅ SBOM saved to {output_file}")
     except Exception as e:
         print(f"❌ Error saving SBOM: {e}")
@@ -4,31 +4,43 @@ PixelTracker - Unified CLI tool for tracking pixel detection
 Combines both basic and enhanced scanners with improved configuration management
 """
 
+import re
 import sys
+import json
 import argparse
 import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
-from pydantic import BaseModel, field_validator
+from dataclasses import dataclass
 
-# Import our modules
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Import our modules. The scanners, tracker database and the
+# cryptography-backed security scanner are imported by the commands that
+# use them, so config and info commands start without them.
 try:
     from config import Config
-    from tracking_pixel_scanner import TrackingPixelScanner
-    from enhanced_tracking_scanner import EnhancedTrackingScanner
-    from tracker_database import tracker_db
     from pixeltracker.security import rate_limiter
     from pixeltracker.compliance import gdpr_ccpa as compliance
-    from pixeltracker.security import security_scanner
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Make sure all required dependencies are installed.")
-    # Try to continue without tracker_db
-    tracker_db = None
     rate_limiter = None
     compliance = None
-    security_scanner = None
+
+def _dump(obj, path) -> None:
+    """Write obj to path as indented JSON, using orjson when available"""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(
+            obj, default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2, default=str)
 
 def setup_logging(config: Config) -> None:
     """Setup logging based on configuration"""
@@ -63,14 +75,12 @@ def setup_logging(config: Config) -> None:
         except Exception as e:
             print(f"Warning: Could not setup file logging: {e}")
 
+_SCHEME_RE = re.compile(r'https?://', re.IGNORECASE)
+
 def validate_urls(urls: List[str]) -> List[str]:
     """Validate and normalize URLs"""
-    validated_urls = []
-    for url in urls:
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        validated_urls.append(url)
-    return validated_urls
+    has_scheme = _SCHEME_RE.match
+    return [url if has_scheme(url) else 'https://' + url for url in urls]
 
 def create_parser() -> argparse.ArgumentParser:
     """Create argument parser"""
@@ -141,7 +151,8 @@ Examples:
     
     return parser
 
-class ScanArgs(BaseModel):
+@dataclass
+class ScanArgs:
     urls: List[str]
     config: Optional[str] = None
     output: Optional[str] = None
@@ -153,15 +164,14 @@ class ScanArgs(BaseModel):
     rate_limit: Optional[float] = None
     detailed_report: Optional[str] = None
 
-    @field_validator('format')
-    @classmethod
-    def validate_format(cls, v):
-        if v not in ['json', 'html', 'csv']:
+    def __post_init__(self):
+        if self.format not in ('json', 'html', 'csv'):
             raise ValueError('format must be "json", "html", or "csv"')
-        return v
 
 async def run_enhanced_scan(config: Config, args: ScanArgs) -> None:
     """Run enhanced scanner"""
+    from enhanced_tracking_scanner import EnhancedTrackingScanner, scan_result_to_dict
+    
     try:
         # Override config with command line arguments
         if args.enable_js:
@@ -172,14 +182,19 @@ async def run_enhanced_scan(config: Config, args: ScanArgs) -> None:
             config.set('scanning.rate_limit_delay', args.rate_limit)
         
         scanner = EnhancedTrackingScanner(args.config)
+        scanner.config['enable_javascript'] = bool(config.get('javascript.enabled', False))
+        scanner.config['concurrent_requests'] = config.get(
+            'scanning.concurrent_requests', scanner.config['concurrent_requests']
+        )
         urls = validate_urls(args.urls)
         
         print(f"🚀 Starting enhanced scan of {len(urls)} URLs...")
         print(f"⚙️  JavaScript execution: {'enabled' if config.get('javascript.enabled') else 'disabled'}")
         print(f"🔧 Concurrent requests: {config.get('scanning.concurrent_requests', 10)}")
         
-        # Perform scans
-        results = await scanner.scan_multiple_urls(urls)
+        # Perform scans over one pooled HTTP session, closed when done
+        async with scanner:
+            results = await scanner.scan_multiple_urls(urls)
         
         # Generate intelligence report
         intelligence_report = scanner.generate_intelligence_report(results)
@@ -200,16 +215,12 @@ async def run_enhanced_scan(config: Config, args: ScanArgs) -> None:
         
         # Save results if requested
         if args.output:
-            import json
-            from dataclasses import asdict
-            
             output_data = {
-                'results': [asdict(result) for result in results],
+                'results': [scan_result_to_dict(result) for result in results],
                 'intelligence_report': intelligence_report
             }
             
-            with open(args.output, 'w') as f:
-                json.dump(output_data, f, indent=2, default=str)
+            _dump(output_data, args.output)
             
             print(f"💾 Results saved to {args.output}")
         
@@ -217,8 +228,10 @@ async def run_enhanced_scan(config: Config, args: ScanArgs) -> None:
         logging.error(f"Enhanced scan failed: {e}")
         sys.exit(1)
 
-def run_basic_scan(config: Config, args) -> None:
+async def run_basic_scan(config: Config, args) -> None:
     """Run basic scanner"""
+    from tracking_pixel_scanner import TrackingPixelScanner
+    
     try:
         # Apply command line overrides
         rate_limit = args.rate_limit if args.rate_limit else config.get('scanning.rate_limit_delay', 1.0)
@@ -226,14 +239,13 @@ def run_basic_scan(config: Config, args) -> None:
         scanner = TrackingPixelScanner(rate_limit_delay=rate_limit)
         urls = validate_urls(args.urls)
         
+        concurrency = args.concurrent or config.get('scanning.concurrent_requests', 10)
+        
         print(f"🚀 Starting basic scan of {len(urls)} URLs...")
-        print(f"⏱️  Rate limit delay: {rate_limit}s")
+        print(f"⏱️  Rate limit delay: {rate_limit}s per host")
         
-        results = []
-        for url in urls:
-            result = scanner.scan_url(url)
-            results.append(result)
-            
+        results = await scanner.ascan_urls(urls, concurrency)
+        for url, result in zip(urls, results):
             # Display summary
             if 'error' in result:
                 print(f"❌ Error scanning {url}: {result['error']}")
@@ -260,9 +272,7 @@ def run_basic_scan(config: Config, args) -> None:
         
         # Save results if requested
         if args.output:
-            import json
-            with open(args.output, 'w') as f:
-                json.dump(results, f, indent=2)
+            _dump(results, args.output)
             print(f"💾 Results saved to {args.output}")
         
     except Exception as e:
@@ -284,7 +294,6 @@ def handle_config_command(args) -> None:
             sys.exit(1)
     
     elif args.show_defaults:
-        import json
         config = Config()
         print(json.dumps(config.config, indent=2))
 
@@ -330,6 +339,12 @@ def handle_info_command(args) -> None:
             print("\n✅ All core dependencies available")
     
     elif args.domains:
+        from tracking_pixel_scanner import TrackingPixelScanner
+        try:
+            from tracker_database import tracker_db
+        except ImportError:
+            tracker_db = None
+        
         scanner = TrackingPixelScanner()
         print(f"📊 Tracking {len(scanner.tracking_domains)} known domains")
         print("🎯 Top 10 domains:")
@@ -356,6 +371,11 @@ def handle_info_command(args) -> None:
 
 async def handle_security_scan_command(args) -> None:
     """Handle security scan command"""
+    try:
+        from pixeltracker.security import security_scanner
+    except ImportError:
+        security_scanner = None
+    
     if not security_scanner:
         print("❌ Security scanner module not available")
         print("Install security dependencies: pip install cryptography")
@@ -398,7 +418,6 @@ async def handle_security_scan_command(args) -> None:
         
         # Save results if requested
         if args.output:
-            import json
             output_data = {
                 'scan_summary': {
                     'total_urls': len(all_results),
@@ -409,8 +428,7 @@ async def handle_security_scan_command(args) -> None:
                 'results': [result.to_dict() for result in all_results]
             }
             
-            with open(args.output, 'w') as f:
-                json.dump(output_data, f, indent=2, default=str)
+            _dump(output_data, args.output)
             
             print(f"💾 Security report saved to {args.output}")
         
@@ -443,7 +461,7 @@ async def main():
         if args.enhanced:
             await run_enhanced_scan(config, args)
         else:
-            run_basic_scan(config, args)
+            await run_basic_scan(config, args)
     
     elif args.command == 'config':
         handle_config_command(args)
@@ -458,7 +476,18 @@ async def main():
         parser.print_help()
         sys.exit(1)
 
+def install_event_loop() -> None:
+    """Use uvloop's libuv-based event loop when it is available"""
+    if sys.platform == 'win32':
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+
 if __name__ == '__main__':
+    install_event_loop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
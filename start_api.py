@@ -33,17 +33,27 @@ def build_dashboard():
     else:
         print("Dashboard directory not found, skipping build")
 
-def start_api(host="0.0.0.0", port=8000, reload=True):
+def start_api(host="0.0.0.0", port=8000, reload=True, workers=None):
     """Start the FastAPI server"""
     cmd = [
         sys.executable, "-m", "uvicorn",
         "api.main:app",
         "--host", host,
         "--port", str(port),
+        # httptools parser; keep idle client connections open for reuse
+        "--http", "httptools",
+        "--timeout-keep-alive", "30",
     ]
     
     if reload:
         cmd.append("--reload")
+    else:
+        # Production: uvloop event loop (ships with uvicorn[standard]). Active
+        # scans and WebSocket state live in process memory, so run a single
+        # worker unless more are requested explicitly.
+        if workers is None:
+            workers = int(os.getenv("WEB_CONCURRENCY", 1))
+        cmd.extend(["--loop", "uvloop", "--workers", str(workers)])
     
     print(f"Starting PixelTracker API on http://{host}:{port}")
     print("API Documentation will be available at /docs")
@@ -59,6 +69,7 @@ def main():
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--no-reload", action="store_true", help="Disable auto-reload")
+    parser.add_argument("--workers", type=int, help="Worker processes without reload (default: $WEB_CONCURRENCY or 1)")
     parser.add_argument("--skip-install", action="store_true", help="Skip dependency installation")
     parser.add_argument("--skip-build", action="store_true", help="Skip dashboard build")
     
@@ -71,7 +82,7 @@ def main():
         if not args.skip_build:
             build_dashboard()
         
-        start_api(args.host, args.port, not args.no_reload)
+        start_api(args.host, args.port, not args.no_reload, args.workers)
         
     except subprocess.CalledProcessError as e:
         print(f"Error: {e}")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Test that the enhanced scanner's fused regex works under RE2 and stdlib re
+"""
+
+import re
+
+import pytest
+
+def test_advanced_tracking_regex_with_re2():
+    """The scanner imports with google-re2 installed and matches like stdlib re"""
+    re2 = pytest.importorskip("re2")
+    scanner = pytest.importorskip("enhanced_tracking_scanner")
+
+    assert scanner.re2 is re2
+
+    stdlib_re = re.compile(scanner._ADVANCED_TRACKING_RE.pattern)
+    content = """
+    <script>
+    var data = CANVAS.toDataURL();
+    var pc = new RTCPeerConnection();
+    ctx.measureText('@FONT-FACE');
+    </script>
+    """
+
+    expected = {match.lastgroup for match in stdlib_re.finditer(content)}
+    assert expected == {'canvas', 'webrtc', 'font'}
+    assert {match.lastgroup for match in scanner._ADVANCED_TRACKING_RE.finditer(content)} == expected
+
+    # Hyperscan, when installed, takes over find_advanced_techniques
+    if scanner._ADVANCED_TRACKING_HS is None:
+        assert scanner.find_advanced_techniques(content) == expected
+
+if __name__ == "__main__":
+    test_advanced_tracking_regex_with_re2()
+    print("✅ Advanced tracking regex test passed")
@@ -6,10 +6,21 @@ Contains extensive patterns and intelligence for tracking detection
 
 import re
 import json
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
+from collections import Counter
 from dataclasses import dataclass, asdict
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 @dataclass
 class TrackerPattern:
     """Represents a tracker pattern with metadata"""
@@ -41,6 +52,9 @@ class TrackerDatabase:
     def load_tracker_database(self):
         """Load comprehensive tracker database"""
         
+        # Every entry is stamped with the same load time
+        loaded_at = datetime.now().isoformat()
+        
         # Google/Alphabet Ecosystem
         self.trackers['google_analytics'] = TrackerPattern(
             name="Google Analytics",
@@ -66,7 +80,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['server_side_proxy', 'custom_domain'],
             first_seen="2005-11-14",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['google_ads'] = TrackerPattern(
@@ -90,7 +104,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['first_party_data', 'cookieless_tracking'],
             first_seen="2007-04-13",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Facebook/Meta Ecosystem
@@ -115,7 +129,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['conversions_api', 'server_side_events'],
             first_seen="2013-10-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Adobe Analytics/Marketing Cloud
@@ -141,7 +155,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['first_party_cookies', 'device_cooperative'],
             first_seen="1996-11-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Social Media Platforms
@@ -163,7 +177,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['mobile_app_events'],
             first_seen="2013-04-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['linkedin_insight'] = TrackerPattern(
@@ -183,7 +197,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['first_party_data_matching'],
             first_seen="2016-05-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['pinterest_tag'] = TrackerPattern(
@@ -203,7 +217,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['enhanced_match'],
             first_seen="2016-02-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['snapchat_pixel'] = TrackerPattern(
@@ -223,7 +237,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['snap_pixel_advanced_matching'],
             first_seen="2016-10-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['tiktok_pixel'] = TrackerPattern(
@@ -244,7 +258,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['events_api'],
             first_seen="2019-03-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Analytics Platforms
@@ -267,7 +281,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['identity_resolution'],
             first_seen="2009-04-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['amplitude'] = TrackerPattern(
@@ -288,7 +302,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['cross_platform_identification'],
             first_seen="2012-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['segment'] = TrackerPattern(
@@ -311,7 +325,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['server_side_libraries'],
             first_seen="2011-10-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # User Experience and Heatmap Tools
@@ -333,7 +347,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['ip_anonymization'],
             first_seen="2014-11-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['fullstory'] = TrackerPattern(
@@ -353,7 +367,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['privacy_controls'],
             first_seen="2014-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['crazyegg'] = TrackerPattern(
@@ -373,7 +387,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['cookieless_tracking'],
             first_seen="2006-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # A/B Testing and Optimization
@@ -395,7 +409,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['edge_side_experiments'],
             first_seen="2010-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Marketing Automation
@@ -417,7 +431,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['progressive_profiling'],
             first_seen="2006-06-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Performance Monitoring
@@ -438,7 +452,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['custom_attributes'],
             first_seen="2008-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Privacy Invasive Techniques
@@ -460,7 +474,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['noise_injection', 'permission_prompts'],
             first_seen="2012-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         self.trackers['webrtc_leak'] = TrackerPattern(
@@ -480,7 +494,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['webrtc_blocking'],
             first_seen="2013-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Ad Networks and Exchanges
@@ -501,7 +515,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['first_party_data'],
             first_seen="2005-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
         
         # Additional patterns for emerging trackers
@@ -522,7 +536,7 @@ class TrackerDatabase:
             detection_method="javascript",
             evasion_techniques=['server_side_api'],
             first_seen="2021-01-01",
-            last_updated=datetime.now().isoformat()
+            last_updated=loaded_at
         )
 
     def compile_patterns(self):
@@ -531,17 +545,62 @@ class TrackerDatabase:
             self.patterns_compiled[tracker_id] = [
                 re.compile(pattern, re.IGNORECASE) for pattern in tracker.patterns
             ]
+        
+        # Hyperscan ids index this list of (tracker_id, pattern index)
+        self.pattern_ids = [
+            (tracker_id, i)
+            for tracker_id, tracker in self.trackers.items()
+            for i in range(len(tracker.patterns))
+        ]
+        self.hyperscan_db = self._compile_hyperscan_db() if hyperscan else None
+    
+    def _compile_hyperscan_db(self):
+        """Compile every pattern into one Hyperscan database, or None if it cannot"""
+        expressions = [
+            self.trackers[tracker_id].patterns[i].encode() for tracker_id, i in self.pattern_ids
+        ]
+        count = len(expressions)
+        db = hyperscan.Database()
+        try:
+            db.compile(
+                expressions=expressions,
+                ids=list(range(count)),
+                elements=count,
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * count
+            )
+        except hyperscan.error:
+            return None
+        return db
+    
+    def find_matching_patterns(self, content: str) -> Set[Tuple[str, int]]:
+        """Return the (tracker_id, pattern index) pairs whose pattern occurs in content"""
+        if self.hyperscan_db is not None:
+            found = set()
+            
+            def on_match(pattern_id, start, end, flags, context):
+                found.add(self.pattern_ids[pattern_id])
+            
+            # One scan of the content checks every pattern
+            self.hyperscan_db.scan(content.encode('utf-8', 'replace'), match_event_handler=on_match)
+            return found
+        
+        return {
+            (tracker_id, i)
+            for tracker_id, i in self.pattern_ids
+            if self.patterns_compiled[tracker_id][i].search(content)
+        }
     
     def detect_trackers(self, content: str, url: str = "") -> List[Dict[str, Any]]:
         """Detect trackers in content using comprehensive pattern matching"""
         detected = []
+        matched_patterns = self.find_matching_patterns(content)
         
         for tracker_id, tracker in self.trackers.items():
             matches = []
             
             # Check compiled patterns
-            for i, pattern in enumerate(self.patterns_compiled[tracker_id]):
-                if pattern.search(content):
+            for i in range(len(tracker.patterns)):
+                if (tracker_id, i) in matched_patterns:
                     matches.append({
                         'pattern': tracker.patterns[i],
                         'type': 'regex_match'
@@ -589,6 +648,9 @@ class TrackerDatabase:
     def export_database(self, format: str = 'json') -> str:
         """Export tracker database in specified format"""
         if format == 'json':
+            if orjson is not None:
+                # orjson serializes the TrackerPattern dataclasses natively
+                return orjson.dumps(self.trackers, option=orjson.OPT_INDENT_2, default=str).decode()
             return json.dumps({
                 tracker_id: asdict(tracker) for tracker_id, tracker in self.trackers.items()
             }, indent=2, default=str)
@@ -596,28 +658,33 @@ class TrackerDatabase:
             raise ValueError(f"Unsupported format: {format}")
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get database statistics"""
-        categories = {}
-        risk_levels = {}
-        detection_methods = {}
+        """Get database statistics in a single pass over the trackers"""
+        categories = Counter()
+        risk_levels = Counter()
+        detection_methods = Counter()
+        total_domains = 0
+        total_patterns = 0
+        gdpr_relevant_count = 0
+        ccpa_relevant_count = 0
         
         for tracker in self.trackers.values():
-            categories[tracker.category] = categories.get(tracker.category, 0) + 1
-            risk_levels[tracker.risk_level] = risk_levels.get(tracker.risk_level, 0) + 1
-            detection_methods[tracker.detection_method] = detection_methods.get(tracker.detection_method, 0) + 1
-        
-        total_domains = sum(len(tracker.domains) for tracker in self.trackers.values())
-        total_patterns = sum(len(tracker.patterns) for tracker in self.trackers.values())
+            categories[tracker.category] += 1
+            risk_levels[tracker.risk_level] += 1
+            detection_methods[tracker.detection_method] += 1
+            total_domains += len(tracker.domains)
+            total_patterns += len(tracker.patterns)
+            gdpr_relevant_count += tracker.gdpr_relevant
+            ccpa_relevant_count += tracker.ccpa_relevant
         
         return {
             'total_trackers': len(self.trackers),
             'total_domains': total_domains,
             'total_patterns': total_patterns,
-            'categories': categories,
-            'risk_levels': risk_levels,
-            'detection_methods': detection_methods,
-            'gdpr_relevant_count': sum(1 for t in self.trackers.values() if t.gdpr_relevant),
-            'ccpa_relevant_count': sum(1 for t in self.trackers.values() if t.ccpa_relevant)
+            'categories': dict(categories),
+            'risk_levels': dict(risk_levels),
+            'detection_methods': dict(detection_methods),
+            'gdpr_relevant_count': gdpr_relevant_count,
+            'ccpa_relevant_count': ccpa_relevant_count
         }
 
 # Global instance
@@ -5,20 +5,30 @@ A tool to scan URLs for tracking pixels and report findings.
 """
 
 import requests
+import aiohttp
+import asyncio
 import argparse
 import re
 from urllib.parse import urlparse, parse_qs
 from bs4 import BeautifulSoup
 import json
-from typing import List, Dict, Any
+from html import escape
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+from collections import Counter
 import os
+import importlib.util
 import time
 import random
 import logging
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Import our comprehensive tracker database
 try:
     from tracker_database import tracker_db
@@ -26,6 +36,189 @@ except ImportError:
     print("Warning: Could not import tracker database. Using fallback patterns.")
     tracker_db = None
 
+# Tracking code patterns searched for in inline script content. Compiled once
+# at import instead of on every script tag of every page.
+JS_TRACKING_PATTERNS = [
+    # Google Analytics & Tag Manager
+    r'ga\(.*?\)',
+    r'gtag\(.*?\)',
+    r'_gaq\.push',
+    r'dataLayer\.push',
+    r'GoogleAnalyticsObject',
+    r'gtm\.',
+
+    # Facebook/Meta
+    r'fbq\(.*?\)',
+    r'_fbq\.',
+    r'facebook\.com/tr',
+
+    # Adobe Analytics
+    r's\.t\(',
+    r's\.tl\(',
+    r'adobe_mc',
+    r'omtrdc\.net',
+    r'demdex\.net',
+
+    # Mixpanel
+    r'mixpanel\.',
+    r'mp_track',
+
+    # Amplitude
+    r'amplitude\.',
+    r'logEvent',
+
+    # Segment
+    r'analytics\.track',
+    r'analytics\.page',
+    r'analytics\.identify',
+
+    # Hotjar
+    r'hj\(',
+    r'hotjar',
+
+    # FullStory
+    r'FS\.',
+    r'fullstory',
+
+    # HubSpot
+    r'_hsq\.push',
+    r'hubspot',
+
+    # Intercom
+    r'Intercom\(',
+    r'intercom_settings',
+
+    # Drift
+    r'drift\.load',
+    r'drift\.track',
+
+    # Optimizely
+    r'optimizely',
+    r'optly',
+
+    # Crazy Egg
+    r'crazyegg',
+    r'CE_API',
+
+    # Heap
+    r'heap\.track',
+    r'heap\.identify',
+
+    # Kissmetrics
+    r'_kmq\.push',
+    r'kissmetrics',
+
+    # LogRocket
+    r'LogRocket',
+    r'logrocket',
+
+    # New Relic
+    r'NREUM',
+    r'newrelic',
+
+    # Sentry
+    r'Sentry\.',
+    r'sentry',
+
+    # Rollbar
+    r'Rollbar',
+    r'rollbar',
+
+    # Bugsnag
+    r'Bugsnag',
+    r'bugsnag',
+
+    # Pinterest
+    r'pintrk\(',
+    r'pinterest',
+
+    # Twitter
+    r'twq\(',
+    r'twitter',
+
+    # LinkedIn
+    r'_linkedin_partner_id',
+    r'linkedin',
+
+    # Snapchat
+    r'snaptr\(',
+    r'snapchat',
+
+    # TikTok
+    r'ttq\.',
+    r'tiktok',
+
+    # Quantcast
+    r'_qevents',
+    r'quantcast',
+
+    # Chartbeat
+    r'_sf_async_config',
+    r'chartbeat',
+
+    # Score Card Research
+    r'COMSCORE',
+    r'scorecardresearch',
+
+    # Microsoft/Bing
+    r'uetq\.push',
+    r'bing',
+
+    # VWO
+    r'_vwo_code',
+    r'vwo',
+
+    # Branch
+    r'branch\.',
+
+    # AppsFlyer
+    r'appsflyer',
+
+    # Adjust
+    r'Adjust',
+
+    # Generic tracking patterns
+    r'track\(',
+    r'pageview',
+    r'event\(',
+    r'identify\(',
+    r'utm_',
+    r'pixel',
+    r'beacon'
+]
+_JS_TRACKING_REGEXES = [(pattern, re.compile(pattern, re.IGNORECASE))
+                        for pattern in JS_TRACKING_PATTERNS]
+
+# BeautifulSoup tree builder: lxml's C parser when installed, else the stdlib one
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# Tracking services by category, for privacy impact analysis
+PRIVACY_CATEGORIES = {
+    'advertising': ['google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'facebook.com', 
+                    'connect.facebook.net', 'criteo.com', 'outbrain.com', 'taboola.com', 'adroll.com'],
+    'analytics': ['mixpanel.com', 'amplitude.com', 'segment.com', 'chartbeat.com', 'quantcast.com'],
+    'social_media': ['twitter.com', 'linkedin.com', 'pinterest.com', 'snapchat.com', 'tiktok.com'],
+    'performance': ['newrelic.com', 'sentry.io', 'rollbar.com', 'bugsnag.com'],
+    'user_experience': ['hotjar.com', 'fullstory.com', 'crazyegg.com', 'mouseflow.com', 'optimizely.com'],
+    'marketing': ['hubspot.com', 'marketo.com', 'mailchimp.com', 'salesforce.com']
+}
+HIGH_RISK_CATEGORIES = ('advertising', 'social_media')
+
+# Privacy score deduction per detected item (same keys as privacy.scoring_weights)
+PRIVACY_SCORE_WEIGHTS = {
+    'tracking_pixel': 5,
+    'external_script': 8,  # External scripts are worse
+    'inline_script': 3,  # Inline scripts less severe
+    'high_risk_domain': 10  # High-risk domains are very bad
+}
+
+# Retry policy shared by the requests and aiohttp fetch paths
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_BG_IMAGE_RE = re.compile(r'background-image:\s*url\(["\']?([^"\')]+)["\']?\)', re.IGNORECASE)
+
 class TrackingPixelScanner:
     def __init__(self, rate_limit_delay=1.0):
         self.rate_limit_delay = rate_limit_delay
@@ -37,6 +230,8 @@ class TrackingPixelScanner:
         ]
         self.session = self._create_session()
         self.logger = logging.getLogger(__name__)
+        # Earliest time each host may be requested again (async scans)
+        self._next_request_at: Dict[str, float] = {}
         
         self.tracking_domains = [
             # Google/Alphabet
@@ -210,6 +405,7 @@ class TrackingPixelScanner:
             'singular.net',
             'tenjin.io'
         ]
+        self._domain_automaton = self._build_domain_automaton()
         
         self.pixel_patterns = [
             r'<img[^>]*src=["\'][^"\']*\.(gif|png|jpg|jpeg)\?[^"\']*["\'][^>]*>',
@@ -220,15 +416,36 @@ class TrackingPixelScanner:
             r'<noscript>.*?<img.*?</noscript>'
         ]
 
+    def _build_domain_automaton(self):
+        """Build an Aho-Corasick automaton over tracking_domains, if available."""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for index, domain in enumerate(self.tracking_domains):
+            automaton.add_word(domain, (index, domain))
+        automaton.make_automaton()
+        return automaton
+
+    def match_tracking_domain(self, text: str) -> Optional[str]:
+        """Return the first entry of tracking_domains contained in text, if any."""
+        if self._domain_automaton is not None:
+            # One pass over text finds every domain; keep list order for ties
+            found = min((value for _, value in self._domain_automaton.iter(text)), default=None)
+            return found[1] if found else None
+        for domain in self.tracking_domains:
+            if domain in text:
+                return domain
+        return None
+
     def _create_session(self):
         """Create a requests session with retry strategy and connection pooling."""
         session = requests.Session()
         
         # Set up retry strategy
         retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=sorted(RETRY_STATUSES),
             method_whitelist=["HEAD", "GET", "OPTIONS"]
         )
         
@@ -253,22 +470,74 @@ class TrackingPixelScanner:
         """Get a random user agent to avoid detection."""
         return random.choice(self.user_agents)
 
+    def _request_headers(self) -> Dict[str, str]:
+        """Browser-like request headers with a random user agent"""
+        return {
+            'User-Agent': self._get_random_user_agent(),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
+
+    async def _wait_for_host_rate_limit(self, host: str):
+        """Space requests to the same host by rate_limit_delay; other hosts proceed."""
+        now = time.monotonic()
+        if host not in self._next_request_at:
+            # Drop hosts whose spacing window has passed, so the table only
+            # holds hosts requested within the last rate_limit_delay seconds
+            expired = [other for other, ready in self._next_request_at.items() if ready <= now]
+            for other in expired:
+                del self._next_request_at[other]
+        slot = max(now, self._next_request_at.get(host, 0.0))
+        self._next_request_at[host] = slot + self.rate_limit_delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def afetch_page(self, session: aiohttp.ClientSession, url: str) -> str:
+        """Fetch the HTML content of a webpage without blocking the event loop.
+
+        Like the session's urllib3 retry policy, retryable statuses,
+        connection errors and timeouts are retried with exponential backoff.
+        """
+        host = urlparse(url).netloc
+        for attempt in range(RETRY_TOTAL + 1):
+            await self._wait_for_host_rate_limit(host)
+            try:
+                async with session.get(url, headers=self._request_headers(),
+                                       timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status in RETRY_STATUSES and attempt < RETRY_TOTAL:
+                        await asyncio.sleep(RETRY_BACKOFF_FACTOR * 2 ** attempt)
+                        continue
+                    response.raise_for_status()
+                    self.logger.info(f"Successfully fetched {url} (Status: {response.status})")
+                    return await response.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt < RETRY_TOTAL:
+                    self.logger.debug(f"Retrying {url} after error: {e!r}")
+                    await asyncio.sleep(RETRY_BACKOFF_FACTOR * 2 ** attempt)
+                    continue
+                if isinstance(e, asyncio.TimeoutError):
+                    self.logger.error(f"Timeout fetching {url}")
+                else:
+                    self.logger.error(f"Connection error fetching {url}: {e}")
+                return ""
+            except aiohttp.ClientResponseError as e:
+                self.logger.error(f"HTTP error fetching {url}: {e}")
+                return ""
+            except aiohttp.ClientError as e:
+                self.logger.error(f"Error fetching {url}: {e}")
+                return ""
+        return ""
+
     def fetch_page(self, url: str) -> str:
         """Fetch the HTML content of a webpage with rate limiting and improved error handling."""
         try:
             # Apply rate limiting
             self._wait_for_rate_limit()
             
-            headers = {
-                'User-Agent': self._get_random_user_agent(),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            
-            response = self.session.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, headers=self._request_headers(), timeout=10)
             response.raise_for_status()
             
             self.logger.info(f"Successfully fetched {url} (Status: {response.status_code})")
@@ -287,10 +556,11 @@ class TrackingPixelScanner:
             self.logger.error(f"Error fetching {url}: {e}")
             return ""
 
-    def find_tracking_pixels(self, html_content: str) -> List[Dict[str, Any]]:
+    def find_tracking_pixels(self, html_content: str, soup=None) -> List[Dict[str, Any]]:
         """Find potential tracking pixels in HTML content."""
         pixels = []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Find all img and iframe tags
         elements = soup.find_all(['img', 'iframe'])
@@ -330,11 +600,7 @@ class TrackingPixelScanner:
         )
         
         # Check if src contains tracking domain
-        tracking_domain = None
-        for domain in self.tracking_domains:
-            if domain in src:
-                tracking_domain = domain
-                break
+        tracking_domain = self.match_tracking_domain(src)
         
         # Check for suspicious URL patterns
         has_tracking_params = any(param in src.lower() for param in [
@@ -439,39 +705,35 @@ class TrackingPixelScanner:
             content = style.string or ''
             
             # Look for background-image URLs
-            bg_image_pattern = r'background-image:\s*url\(["\']?([^"\')]+)["\']?\)'
-            matches = re.findall(bg_image_pattern, content, re.IGNORECASE)
+            matches = _BG_IMAGE_RE.findall(content)
             
             for match in matches:
                 # Check if it's from a tracking domain
-                for domain in self.tracking_domains:
-                    if domain in match:
-                        css_trackers.append({
-                            'type': 'css_background',
-                            'url': match,
-                            'domain': domain,
-                            'element': str(style)
-                        })
-                        break
+                domain = self.match_tracking_domain(match)
+                if domain:
+                    css_trackers.append({
+                        'type': 'css_background',
+                        'url': match,
+                        'domain': domain,
+                        'element': str(style)
+                    })
         
         # Check inline styles
         elements_with_style = soup.find_all(attrs={'style': True})
         for element in elements_with_style:
             style = element.get('style', '')
             if 'background-image' in style:
-                bg_image_pattern = r'background-image:\s*url\(["\']?([^"\')]+)["\']?\)'
-                matches = re.findall(bg_image_pattern, style, re.IGNORECASE)
+                matches = _BG_IMAGE_RE.findall(style)
                 
                 for match in matches:
-                    for domain in self.tracking_domains:
-                        if domain in match:
-                            css_trackers.append({
-                                'type': 'inline_css_background',
-                                'url': match,
-                                'domain': domain,
-                                'element': str(element)
-                            })
-                            break
+                    domain = self.match_tracking_domain(match)
+                    if domain:
+                        css_trackers.append({
+                            'type': 'inline_css_background',
+                            'url': match,
+                            'domain': domain,
+                            'element': str(element)
+                        })
         
         return css_trackers
 
@@ -501,10 +763,11 @@ class TrackingPixelScanner:
         
         return formatted_trackers
 
-    def find_javascript_trackers(self, html_content: str) -> List[Dict[str, Any]]:
+    def find_javascript_trackers(self, html_content: str, soup=None) -> List[Dict[str, Any]]:
         """Find JavaScript-based tracking code."""
         trackers = []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Find all script tags
         scripts = soup.find_all('script')
@@ -514,168 +777,20 @@ class TrackingPixelScanner:
             content = script.string or ''
             
             # Check for tracking domains in script sources
-            for domain in self.tracking_domains:
-                if domain in src:
-                    trackers.append({
-                        'type': 'external_script',
-                        'domain': domain,
-                        'src': src,
-                        'element': str(script)
-                    })
-                    break
+            domain = self.match_tracking_domain(src) if src else None
+            if domain:
+                trackers.append({
+                    'type': 'external_script',
+                    'domain': domain,
+                    'src': src,
+                    'element': str(script)
+                })
             
             # Check for tracking code patterns in script content
-            tracking_patterns = [
-                # Google Analytics & Tag Manager
-                r'ga\(.*?\)',
-                r'gtag\(.*?\)',
-                r'_gaq\.push',
-                r'dataLayer\.push',
-                r'GoogleAnalyticsObject',
-                r'gtm\.',
-                
-                # Facebook/Meta
-                r'fbq\(.*?\)',
-                r'_fbq\.',
-                r'facebook\.com/tr',
-                
-                # Adobe Analytics
-                r's\.t\(',
-                r's\.tl\(',
-                r'adobe_mc',
-                r'omtrdc\.net',
-                r'demdex\.net',
-                
-                # Mixpanel
-                r'mixpanel\.',
-                r'mp_track',
-                
-                # Amplitude
-                r'amplitude\.',
-                r'logEvent',
-                
-                # Segment
-                r'analytics\.track',
-                r'analytics\.page',
-                r'analytics\.identify',
-                
-                # Hotjar
-                r'hj\(',
-                r'hotjar',
-                
-                # FullStory
-                r'FS\.',
-                r'fullstory',
-                
-                # HubSpot
-                r'_hsq\.push',
-                r'hubspot',
-                
-                # Intercom
-                r'Intercom\(',
-                r'intercom_settings',
-                
-                # Drift
-                r'drift\.load',
-                r'drift\.track',
-                
-                # Optimizely
-                r'optimizely',
-                r'optly',
-                
-                # Crazy Egg
-                r'crazyegg',
-                r'CE_API',
-                
-                # Heap
-                r'heap\.track',
-                r'heap\.identify',
-                
-                # Kissmetrics
-                r'_kmq\.push',
-                r'kissmetrics',
-                
-                # LogRocket
-                r'LogRocket',
-                r'logrocket',
-                
-                # New Relic
-                r'NREUM',
-                r'newrelic',
-                
-                # Sentry
-                r'Sentry\.',
-                r'sentry',
-                
-                # Rollbar
-                r'Rollbar',
-                r'rollbar',
-                
-                # Bugsnag
-                r'Bugsnag',
-                r'bugsnag',
-                
-                # Pinterest
-                r'pintrk\(',
-                r'pinterest',
-                
-                # Twitter
-                r'twq\(',
-                r'twitter',
-                
-                # LinkedIn
-                r'_linkedin_partner_id',
-                r'linkedin',
-                
-                # Snapchat
-                r'snaptr\(',
-                r'snapchat',
-                
-                # TikTok
-                r'ttq\.',
-                r'tiktok',
-                
-                # Quantcast
-                r'_qevents',
-                r'quantcast',
-                
-                # Chartbeat
-                r'_sf_async_config',
-                r'chartbeat',
-                
-                # Score Card Research
-                r'COMSCORE',
-                r'scorecardresearch',
-                
-                # Microsoft/Bing
-                r'uetq\.push',
-                r'bing',
-                
-                # VWO
-                r'_vwo_code',
-                r'vwo',
-                
-                # Branch
-                r'branch\.',
-                
-                # AppsFlyer
-                r'appsflyer',
-                
-                # Adjust
-                r'Adjust',
-                
-                # Generic tracking patterns
-                r'track\(',
-                r'pageview',
-                r'event\(',
-                r'identify\(',
-                r'utm_',
-                r'pixel',
-                r'beacon'
-            ]
-            
-            for pattern in tracking_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
+            if not content:
+                continue
+            for pattern, regex in _JS_TRACKING_REGEXES:
+                if regex.search(content):
                     trackers.append({
                         'type': 'inline_script',
                         'pattern': pattern,
@@ -687,34 +802,25 @@ class TrackingPixelScanner:
     def analyze_privacy_impact(self, domains, pixels, js_trackers, meta_trackers, css_trackers) -> Dict[str, Any]:
         """Analyze the privacy impact of detected trackers."""
         
-        # Categorize tracking services
-        categories = {
-            'advertising': ['google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'facebook.com', 
-                           'connect.facebook.net', 'criteo.com', 'outbrain.com', 'taboola.com', 'adroll.com'],
-            'analytics': ['mixpanel.com', 'amplitude.com', 'segment.com', 'chartbeat.com', 'quantcast.com'],
-            'social_media': ['twitter.com', 'linkedin.com', 'pinterest.com', 'snapchat.com', 'tiktok.com'],
-            'performance': ['newrelic.com', 'sentry.io', 'rollbar.com', 'bugsnag.com'],
-            'user_experience': ['hotjar.com', 'fullstory.com', 'crazyegg.com', 'mouseflow.com', 'optimizely.com'],
-            'marketing': ['hubspot.com', 'marketo.com', 'mailchimp.com', 'salesforce.com']
-        }
-        
         detected_categories = set()
         high_risk_domains = []
         
         for domain in domains:
-            for category, category_domains in categories.items():
+            for category, category_domains in PRIVACY_CATEGORIES.items():
                 if any(cat_domain in domain for cat_domain in category_domains):
                     detected_categories.add(category)
-                    if category in ['advertising', 'social_media']:
+                    if category in HIGH_RISK_CATEGORIES:
                         high_risk_domains.append(domain)
         
         # Calculate privacy score (0-100, lower is worse for privacy)
-        privacy_score = 100
-        privacy_score -= len(pixels) * 5  # Each pixel reduces score by 5
-        privacy_score -= len([t for t in js_trackers if t['type'] == 'external_script']) * 8  # External scripts are worse
-        privacy_score -= len([t for t in js_trackers if t['type'] == 'inline_script']) * 3  # Inline scripts less severe
-        privacy_score -= len(high_risk_domains) * 10  # High-risk domains are very bad
-        privacy_score = max(0, privacy_score)  # Don't go below 0
+        js_type_counts = Counter(t['type'] for t in js_trackers)
+        deductions = (
+            len(pixels) * PRIVACY_SCORE_WEIGHTS['tracking_pixel'] +
+            js_type_counts['external_script'] * PRIVACY_SCORE_WEIGHTS['external_script'] +
+            js_type_counts['inline_script'] * PRIVACY_SCORE_WEIGHTS['inline_script'] +
+            len(high_risk_domains) * PRIVACY_SCORE_WEIGHTS['high_risk_domain']
+        )
+        privacy_score = max(0, 100 - deductions)  # Don't go below 0
         
         return {
             'privacy_score': privacy_score,
@@ -807,19 +913,20 @@ class TrackingPixelScanner:
 </body>
 </html>'''
         
-        content = ""
+        # Collect fragments and join once; repeated += copies the growing report
+        parts = []
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         for result in results:
             if 'error' in result:
-                content += f'<div class="url-section"><h2>❌ {result.get("url", "Unknown URL")}</h2><p>Error: {result["error"]}</p></div>'
+                parts.append(f'<div class="url-section"><h2>❌ {escape(str(result.get("url", "Unknown URL")))}</h2><p>Error: {escape(str(result["error"]))}</p></div>')
                 continue
             
             privacy = result.get('privacy_analysis', {})
             
-            content += f'''
+            parts.append(f'''
             <div class="url-section">
-                <h2>🌐 {result['url']}</h2>
+                <h2>🌐 {escape(result['url'])}</h2>
                 
                 <div class="summary-grid">
                     <div class="summary-card">
@@ -844,46 +951,47 @@ class TrackingPixelScanner:
                     </div>
                 </div>
                 
-                <div class="privacy-score privacy-{privacy.get('risk_level', 'medium').lower()}">
+                <div class="privacy-score privacy-{escape(privacy.get('risk_level', 'medium').lower())}">
                     <h3>🔒 Privacy Analysis</h3>
                     <p><strong>Privacy Score:</strong> {privacy.get('privacy_score', 'N/A')}/100</p>
-                    <p><strong>Risk Level:</strong> {privacy.get('risk_level', 'Unknown')}</p>
-                    <p><strong>Categories Detected:</strong> {', '.join(privacy.get('detected_categories', []))}</p>
+                    <p><strong>Risk Level:</strong> {escape(privacy.get('risk_level', 'Unknown'))}</p>
+                    <p><strong>Categories Detected:</strong> {escape(', '.join(privacy.get('detected_categories', [])))}</p>
                 </div>
                 
                 <div class="domain-list">
                     <strong>Tracking Domains:</strong>
-            '''
+            ''')
             
+            high_risk_domains = set(privacy.get('high_risk_domains', []))
             for domain in result['summary']['domains_found']:
-                risk_class = 'high-risk' if domain in privacy.get('high_risk_domains', []) else ''
-                content += f'<span class="domain-badge {risk_class}">{domain}</span>'
+                risk_class = 'high-risk' if domain in high_risk_domains else ''
+                parts.append(f'<span class="domain-badge {risk_class}">{escape(domain)}</span>')
             
-            content += '</div>'
+            parts.append('</div>')
             
             # Add detailed tracker information
             if result['tracking_pixels']:
-                content += '<div class="tracker-section"><h3>📊 Tracking Pixels Details</h3>'
+                parts.append('<div class="tracker-section"><h3>📊 Tracking Pixels Details</h3>')
                 for pixel in result['tracking_pixels']:
-                    content += f'''
+                    parts.append(f'''
                     <div class="tracker-item">
-                        <div class="tracker-type">Pixel: {pixel.get('element_type', 'Unknown')}</div>
-                        <p><strong>Source:</strong> {pixel.get('src', 'N/A')[:100]}...</p>
-                        <p><strong>Domain:</strong> {pixel.get('tracking_domain', 'Unknown')}</p>
+                        <div class="tracker-type">Pixel: {escape(str(pixel.get('element_type', 'Unknown')))}</div>
+                        <p><strong>Source:</strong> {escape(pixel.get('src', 'N/A')[:100])}...</p>
+                        <p><strong>Domain:</strong> {escape(str(pixel.get('tracking_domain', 'Unknown')))}</p>
                         <p><strong>1x1 Pixel:</strong> {pixel.get('is_1x1_pixel', False)}</p>
                     </div>
-                    '''
-                content += '</div>'
+                    ''')
+                parts.append('</div>')
             
             # Add recommendations
             if privacy.get('recommendations'):
-                content += '<div class="recommendations"><h3>💡 Privacy Recommendations</h3><ul>'
-                for rec in privacy['recommendations']:
-                    content += f'<li>{rec}</li>'
-                content += '</ul></div>'
+                parts.append('<div class="recommendations"><h3>💡 Privacy Recommendations</h3><ul>')
+                parts.extend(f'<li>{escape(rec)}</li>' for rec in privacy['recommendations'])
+                parts.append('</ul></div>')
             
-            content += '</div>'
+            parts.append('</div>')
         
+        content = ''.join(parts)
         return html_template.format(timestamp=timestamp, content=content)
     
     def generate_enhanced_json_report(self, results: List[Dict[str, Any]]) -> str:
@@ -923,14 +1031,46 @@ class TrackingPixelScanner:
         print(f"Scanning {url}...")
         
         html_content = self.fetch_page(url)
+        return self.analyze_page(url, html_content)
+
+    async def ascan_url(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        """Async version of scan_url that fetches through a shared aiohttp session."""
+        print(f"Scanning {url}...")
+        
+        html_content = await self.afetch_page(session, url)
+        return self.analyze_page(url, html_content)
+
+    async def ascan_urls(self, urls: List[str], concurrency: int = 10,
+                         timeout: float = 60) -> List[Dict[str, Any]]:
+        """Scan several URLs concurrently; results are in the same order as urls.
+
+        A URL whose scan takes longer than ``timeout`` seconds gets an error
+        result instead of holding up the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def scan(session, url):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self.ascan_url(session, url), timeout)
+                except asyncio.TimeoutError:
+                    self.logger.error(f"Timed out scanning {url}")
+                    return {'error': f'Scan timed out after {timeout}s'}
+        
+        async with aiohttp.ClientSession() as session:
+            return await asyncio.gather(*(scan(session, url) for url in urls))
+
+    def analyze_page(self, url: str, html_content: str) -> Dict[str, Any]:
+        """Run every detection method over a fetched page."""
         if not html_content:
             return {'error': 'Failed to fetch page content'}
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Parse once and share the tree between the detection methods
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Run all detection methods
-        pixels = self.find_tracking_pixels(html_content)
-        js_trackers = self.find_javascript_trackers(html_content)
+        pixels = self.find_tracking_pixels(html_content, soup)
+        js_trackers = self.find_javascript_trackers(html_content, soup)
         meta_trackers = self.find_meta_tracking(soup)
         css_trackers = self.find_css_tracking(soup)
         comprehensive_trackers = self.find_comprehensive_trackers(html_content, url)